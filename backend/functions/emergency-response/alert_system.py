@@ -1,72 +1,265 @@
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable, Final, FrozenSet, Mapping, Union
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
 from datetime import datetime, timezone
-import json
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Night hours (22:00-06:59 local time) trigger the night protocol
+_NIGHT_HOURS: Final[FrozenSet[int]] = frozenset(range(22, 24)) | frozenset(range(0, 7))
+
+# [last refresh epoch seconds, local hour], refreshed at most once a minute
+_HOUR_CACHE: Final[List[float]] = [0.0, 0]
+
+def _current_hour() -> int:
+    """Return the local wall-clock hour, cached for 60 seconds"""
+    now = time.time()
+    if now - _HOUR_CACHE[0] > 60:
+        _HOUR_CACHE[:] = [now, time.localtime(now).tm_hour]
+    return int(_HOUR_CACHE[1])
+
+# (vital, attr, min, max, normal_range, critical_min, critical_max)
+_Threshold = Tuple[str, str, Union[int, float], Union[int, float], str, float, float]
+
+def _threshold(vital: str, attr: str, low: Union[int, float], high: Union[int, float]) -> _Threshold:
+    """Precompute (vital, attr, min, max, normal_range, critical_min, critical_max)"""
+    return (vital, attr, low, high, f"{low}-{high}", low * 0.8, high * 1.2)
+
+# Critical vital sign thresholds used by emergency summaries
+_CRITICAL_THRESHOLDS: Final[Tuple[_Threshold, ...]] = (
+    _threshold('heart_rate', 'hr', 40, 150),
+    _threshold('systolic_pressure', 'sys', 80, 200),
+    _threshold('diastolic_pressure', 'dia', 50, 120),
+    _threshold('core_temperature', 'temp', 35.0, 39.5),
+    _threshold('oxygen_saturation', 'spo2', 88, 100),
+    _threshold('respiratory_rate', 'rr', 8, 30),
+    _threshold('glucose_level', 'glucose', 60, 300)
+)
+
+# Static monitoring instructions shared by every emergency summary
+_MONITORING_PARAMETERS: Final[Tuple[str, ...]] = (
+    'Heart rate and rhythm',
+    'Blood pressure',
+    'Respiratory rate',
+    'Oxygen saturation',
+    'Level of consciousness',
+    'Temperature'
+)
+
+_MONITORING_ALERT_CONDITIONS: Final[Tuple[str, ...]] = (
+    'Any vital sign deterioration',
+    'Loss of consciousness',
+    'Difficulty breathing',
+    'Chest pain',
+    'Severe headache',
+    'Confusion or disorientation'
+)
+
+# Escalation steps, sliced by the protocol's escalation_levels
+_ESCALATION_PLAN: Final[Tuple[Dict[str, Any], ...]] = (
+    {
+        'level': 1,
+        'trigger': 'Initial alert',
+        'actions': ('Notify emergency contacts', 'Begin monitoring'),
+        'timeframe': 'Immediate'
+    },
+    {
+        'level': 2,
+        'trigger': 'No improvement in 10 minutes',
+        'actions': ('Alert healthcare providers', 'Consider EMS'),
+        'timeframe': '10 minutes'
+    },
+    {
+        'level': 3,
+        'trigger': 'Deterioration or no response',
+        'actions': ('Call EMS immediately', 'Prepare for transport'),
+        'timeframe': '15 minutes'
+    }
+)
+
+@dataclass(slots=True)
+class Protocol:
+    """Emergency response protocol determined for a single alert"""
+    
+    response_time_seconds: int
+    auto_call_ems: bool
+    notify_emergency_contacts: bool
+    alert_healthcare_providers: bool
+    require_immediate_consultation: bool
+    increase_monitoring: bool
+    send_sms: bool
+    send_email: bool
+    send_push: bool
+    escalation_levels: int
+    follow_up_intervals: Tuple[int, ...]  # minutes
+    emergency_classification: Optional[str] = None
+    medical_code: Optional[str] = None
+    monitoring_duration_minutes: Optional[int] = None
+    night_protocol: bool = False
+    elderly_patient: bool = False
+    determined_at: Optional[str] = None
+    protocol_version: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict for the JSON boundary, omitting unset fields"""
+        return {
+            name: value
+            for name in _PROTOCOL_FIELDS
+            if (value := getattr(self, name)) is not None
+        }
+
+_PROTOCOL_FIELDS: Final[Tuple[str, ...]] = tuple(field.name for field in fields(Protocol))
+
+@dataclass(slots=True)
+class VitalsView:
+    """Vital signs pulled out of a health data payload once per alert (None when missing)"""
+    
+    hr: Optional[float]
+    sys: Optional[float]
+    dia: Optional[float]
+    temp: Optional[float]
+    spo2: Optional[float]
+    rr: Optional[float]
+    glucose: Optional[float]
+    hrv: Optional[float]
+    rhythm: Optional[str]
+    health_data: Dict[str, Any]
+
+def _build_view(health_data: Dict[str, Any]) -> VitalsView:
+    """Scan health data once and build the vitals view shared by all assessments"""
+    
+    get = health_data.get
+    bp = get('blood_pressure') or {}
+    
+    return VitalsView(
+        hr=get('heart_rate'),
+        sys=bp.get('systolic', 120) if bp else None,
+        dia=bp.get('diastolic', 80) if bp else None,
+        temp=get('core_temperature'),
+        spo2=get('oxygen_saturation'),
+        rr=get('respiratory_rate'),
+        glucose=get('glucose_level'),
+        hrv=get('heart_rate_variability'),
+        rhythm=get('heart_rhythm'),
+        health_data=health_data
+    )
+
+def _hr_risk(hr: Optional[float]) -> float:
+    """Heart rate risk (0.0 when missing)"""
+    if hr is None:
+        return 0.0
+    if hr < 30 or hr > 180:
+        return 1.0
+    if hr < 40 or hr > 150:
+        return 0.8
+    if hr < 50 or hr > 120:
+        return 0.4
+    return 0.0
+
+def _bp_risk(systolic: Optional[float], diastolic: Optional[float]) -> float:
+    """Blood pressure risk (0.0 when missing)"""
+    if systolic is None or diastolic is None:
+        return 0.0
+    if systolic > 220 or diastolic > 130 or systolic < 70:
+        return 1.0
+    if systolic > 180 or diastolic > 110 or systolic < 90:
+        return 0.7
+    if systolic > 160 or diastolic > 100:
+        return 0.4
+    return 0.0
+
+def _temp_risk(temp: Optional[float]) -> float:
+    """Core temperature risk (0.0 when missing)"""
+    if temp is None:
+        return 0.0
+    if temp > 41.0 or temp < 34.0:
+        return 1.0
+    if temp > 39.5 or temp < 35.0:
+        return 0.6
+    if temp > 38.5 or temp < 36.0:
+        return 0.3
+    return 0.0
+
+def _spo2_risk(spo2: Optional[float]) -> float:
+    """Oxygen saturation risk (0.0 when missing)"""
+    if spo2 is None:
+        return 0.0
+    if spo2 < 80:
+        return 1.0
+    if spo2 < 88:
+        return 0.8
+    if spo2 < 92:
+        return 0.4
+    return 0.0
+
+# Emergency response protocols based on medical standards
+_RESPONSE_PROTOCOLS: Final[Mapping[str, Protocol]] = MappingProxyType({
+    'CRITICAL': Protocol(
+        response_time_seconds=60,
+        auto_call_ems=True,
+        notify_emergency_contacts=True,
+        alert_healthcare_providers=True,
+        require_immediate_consultation=True,
+        increase_monitoring=True,
+        send_sms=True,
+        send_email=True,
+        send_push=True,
+        escalation_levels=3,
+        follow_up_intervals=(5, 15, 30)
+    ),
+    'HIGH': Protocol(
+        response_time_seconds=180,
+        auto_call_ems=False,
+        notify_emergency_contacts=True,
+        alert_healthcare_providers=True,
+        require_immediate_consultation=True,
+        increase_monitoring=True,
+        send_sms=True,
+        send_email=True,
+        send_push=True,
+        escalation_levels=2,
+        follow_up_intervals=(10, 30)
+    ),
+    'MEDIUM': Protocol(
+        response_time_seconds=600,
+        auto_call_ems=False,
+        notify_emergency_contacts=True,
+        alert_healthcare_providers=False,
+        require_immediate_consultation=False,
+        increase_monitoring=True,
+        send_sms=True,
+        send_email=False,
+        send_push=True,
+        escalation_levels=1,
+        follow_up_intervals=(30,)
+    ),
+    'LOW': Protocol(
+        response_time_seconds=1800,
+        auto_call_ems=False,
+        notify_emergency_contacts=False,
+        alert_healthcare_providers=False,
+        require_immediate_consultation=False,
+        increase_monitoring=False,
+        send_sms=False,
+        send_email=False,
+        send_push=True,
+        escalation_levels=0,
+        follow_up_intervals=()
+    )
+})
+
 class EmergencyAlertSystem:
-    """Production-grade emergency alert system for healthcare emergencies"""[2]
+    """Production-grade emergency alert system for healthcare emergencies"""
     
-    def __init__(self):
+    def __init__(self) -> None:
         # Emergency response protocols based on medical standards
-        self.response_protocols = {
-            'CRITICAL': {
-                'response_time_seconds': 60,
-                'auto_call_ems': True,
-                'notify_emergency_contacts': True,
-                'alert_healthcare_providers': True,
-                'require_immediate_consultation': True,
-                'increase_monitoring': True,
-                'send_sms': True,
-                'send_email': True,
-                'send_push': True,
-                'escalation_levels': 3,
-                'follow_up_intervals': [5, 15, 30]  # minutes
-            },
-            'HIGH': {
-                'response_time_seconds': 180,
-                'auto_call_ems': False,
-                'notify_emergency_contacts': True,
-                'alert_healthcare_providers': True,
-                'require_immediate_consultation': True,
-                'increase_monitoring': True,
-                'send_sms': True,
-                'send_email': True,
-                'send_push': True,
-                'escalation_levels': 2,
-                'follow_up_intervals': [10, 30]
-            },
-            'MEDIUM': {
-                'response_time_seconds': 600,
-                'auto_call_ems': False,
-                'notify_emergency_contacts': True,
-                'alert_healthcare_providers': False,
-                'require_immediate_consultation': False,
-                'increase_monitoring': True,
-                'send_sms': True,
-                'send_email': False,
-                'send_push': True,
-                'escalation_levels': 1,
-                'follow_up_intervals': [30]
-            },
-            'LOW': {
-                'response_time_seconds': 1800,
-                'auto_call_ems': False,
-                'notify_emergency_contacts': False,
-                'alert_healthcare_providers': False,
-                'require_immediate_consultation': False,
-                'increase_monitoring': False,
-                'send_sms': False,
-                'send_email': False,
-                'send_push': True,
-                'escalation_levels': 0,
-                'follow_up_intervals': []
-            }
-        }
+        self.response_protocols = _RESPONSE_PROTOCOLS
         
         # Medical emergency classifications
-        self.emergency_classifications = {
+        self.emergency_classifications: Dict[str, Dict[str, Any]] = {
             'cardiac_arrest': {
                 'urgency_level': 'CRITICAL',
                 'ems_required': True,
@@ -128,205 +321,213 @@ class EmergencyAlertSystem:
                 'medical_code': 'Heat Emergency'
             }
         }
+        
+        # Assembled protocols keyed on the few facts they depend on, so warm
+        # invocations with the same shape of emergency skip reassembly
+        self._protocol_cache: Callable[[str, str, Optional[str], bool, bool, bool], Protocol] = (
+            lru_cache(maxsize=64)(self._assemble_protocol)
+        )
     
     def determine_response_protocol(
         self, 
         urgency_level: str, 
         alert_type: str, 
         health_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Determine appropriate response protocol based on emergency parameters"""[2]
+    ) -> Protocol:
+        """Determine appropriate response protocol based on emergency parameters"""
         
         try:
-            # Get base protocol for urgency level
-            base_protocol = self.response_protocols.get(urgency_level, self.response_protocols['MEDIUM'])
-            protocol = base_protocol.copy()
+            # Scan vitals once and share the view across all assessments
+            vitals = _build_view(health_data)
             
             # Classify emergency type based on health data
-            emergency_classification = self._classify_emergency(health_data, alert_type)
+            emergency_classification = self._classify_emergency(vitals, alert_type)
             
-            if emergency_classification:
-                # Override protocol settings based on specific emergency type
-                classification_data = self.emergency_classifications[emergency_classification]
-                
-                if classification_data['ems_required']:
-                    protocol['auto_call_ems'] = True
-                
-                if classification_data['response_time_seconds'] < protocol['response_time_seconds']:
-                    protocol['response_time_seconds'] = classification_data['response_time_seconds']
-                
-                protocol['emergency_classification'] = emergency_classification
-                protocol['medical_code'] = classification_data['medical_code']
-            
-            # Add contextual modifications
-            protocol = self._apply_contextual_modifications(protocol, health_data, alert_type)
+            # Cached protocols are shared, so hand out a copy
+            protocol = replace(self._protocol_cache(
+                urgency_level,
+                alert_type,
+                emergency_classification,
+                self._count_abnormal_vitals(vitals) >= 3,
+                _current_hour() in _NIGHT_HOURS,
+                self._is_elderly_patient(health_data)
+            ))
             
             # Add timestamp and metadata
-            protocol['determined_at'] = datetime.now(timezone.utc).isoformat()
-            protocol['protocol_version'] = '2024.1'
+            protocol.determined_at = datetime.now(timezone.utc).isoformat()
+            protocol.protocol_version = '2024.1'
             
-            logger.info(f"Response protocol determined: {urgency_level} - {emergency_classification}")
+            logger.info("Response protocol determined: %s - %s", urgency_level, emergency_classification)
             
             return protocol
             
         except Exception as e:
-            logger.error(f"Error determining response protocol: {str(e)}")
+            logger.error("Error determining response protocol: %s", e)
             # Return safe default protocol
-            return self.response_protocols['HIGH']
+            return replace(self.response_protocols['HIGH'])
     
-    def _classify_emergency(self, health_data: Dict[str, Any], alert_type: str) -> Optional[str]:
-        """Classify emergency type based on health data patterns"""
-        
-        try:
-            # Cardiac emergencies
-            if 'heart_rate' in health_data:
-                hr = health_data['heart_rate']
-                if hr < 30 or hr > 180:
-                    return 'cardiac_arrest'
-                elif hr < 40 or hr > 150:
-                    return 'severe_arrhythmia'
-            
-            # Blood pressure emergencies
-            if 'blood_pressure' in health_data:
-                bp = health_data['blood_pressure']
-                systolic = bp.get('systolic', 120)
-                diastolic = bp.get('diastolic', 80)
-                
-                if systolic > 220 or diastolic > 130:
-                    return 'hypertensive_crisis'
-                elif systolic < 70 or diastolic < 40:
-                    return 'severe_hypotension'
-            
-            # Glucose emergencies
-            if 'glucose_level' in health_data:
-                glucose = health_data['glucose_level']
-                if glucose < 40:
-                    return 'severe_hypoglycemia'
-                elif glucose > 500:
-                    return 'diabetic_ketoacidosis'
-            
-            # Oxygen emergencies
-            if 'oxygen_saturation' in health_data:
-                spo2 = health_data['oxygen_saturation']
-                if spo2 < 80:
-                    return 'severe_hypoxemia'
-            
-            # Respiratory emergencies
-            if 'respiratory_rate' in health_data:
-                rr = health_data['respiratory_rate']
-                if rr < 6 or rr > 35:
-                    return 'respiratory_distress'
+    def _assemble_protocol(
+        self,
+        urgency_level: str,
+        alert_type: str,
+        emergency_classification: Optional[str],
+        many_abnormal_vitals: bool,
+        night_time: bool,
+        elderly_patient: bool
+    ) -> Protocol:
+        """Build the protocol for an emergency shape (cached via _protocol_cache)"""
+        
+        # Get base protocol for urgency level
+        base_protocol = self.response_protocols.get(urgency_level, self.response_protocols['MEDIUM'])
+        protocol = replace(base_protocol)
+        
+        if emergency_classification:
+            # Override protocol settings based on specific emergency type
+            classification_data = self.emergency_classifications[emergency_classification]
             
-            # Temperature emergencies
-            if 'core_temperature' in health_data:
-                temp = health_data['core_temperature']
-                if temp > 41.0:
-                    return 'hyperthermia'
+            if classification_data['ems_required']:
+                protocol.auto_call_ems = True
             
-            # ECG-based emergencies
-            if 'heart_rhythm' in health_data:
-                rhythm = health_data['heart_rhythm']
-                if rhythm in ['ventricular_fibrillation', 'ventricular_tachycardia', 'asystole']:
-                    return 'cardiac_arrest'
-                elif rhythm == 'atrial_fibrillation' and 'heart_rate' in health_data:
-                    if health_data['heart_rate'] > 150:
-                        return 'severe_arrhythmia'
+            if classification_data['response_time_seconds'] < protocol.response_time_seconds:
+                protocol.response_time_seconds = classification_data['response_time_seconds']
             
-            # Stroke indicators (would need more sophisticated analysis in production)
-            if alert_type == 'neurological' or 'confusion' in str(health_data).lower():
-                return 'stroke'
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error classifying emergency: {str(e)}")
-            return None
+            protocol.emergency_classification = emergency_classification
+            protocol.medical_code = classification_data['medical_code']
+        
+        # Add contextual modifications
+        return self._apply_contextual_modifications(
+            protocol, alert_type, many_abnormal_vitals, night_time, elderly_patient
+        )
+    
+    def _classify_emergency(self, vitals: VitalsView, alert_type: str) -> Optional[str]:
+        """Classify emergency type based on health data patterns"""
+        
+        # Cardiac emergencies
+        hr = vitals.hr
+        if hr is not None:
+            if hr < 30 or hr > 180:
+                return 'cardiac_arrest'
+            elif hr < 40 or hr > 150:
+                return 'severe_arrhythmia'
+        
+        # Blood pressure emergencies
+        systolic = vitals.sys
+        diastolic = vitals.dia
+        if systolic is not None and diastolic is not None:
+            if systolic > 220 or diastolic > 130:
+                return 'hypertensive_crisis'
+            elif systolic < 70 or diastolic < 40:
+                return 'severe_hypotension'
+        
+        # Glucose emergencies
+        glucose = vitals.glucose
+        if glucose is not None:
+            if glucose < 40:
+                return 'severe_hypoglycemia'
+            elif glucose > 500:
+                return 'diabetic_ketoacidosis'
+        
+        # Oxygen emergencies
+        if vitals.spo2 is not None and vitals.spo2 < 80:
+            return 'severe_hypoxemia'
+        
+        # Respiratory emergencies
+        rr = vitals.rr
+        if rr is not None and (rr < 6 or rr > 35):
+            return 'respiratory_distress'
+        
+        # Temperature emergencies
+        if vitals.temp is not None and vitals.temp > 41.0:
+            return 'hyperthermia'
+        
+        # ECG-based emergencies
+        rhythm = vitals.rhythm
+        if rhythm is not None:
+            if rhythm in ('ventricular_fibrillation', 'ventricular_tachycardia', 'asystole'):
+                return 'cardiac_arrest'
+            elif rhythm == 'atrial_fibrillation' and hr is not None:
+                if hr > 150:
+                    return 'severe_arrhythmia'
+        
+        # Stroke indicators (would need more sophisticated analysis in production)
+        if alert_type == 'neurological' or 'confusion' in str(vitals.health_data).lower():
+            return 'stroke'
+        
+        return None
     
     def _apply_contextual_modifications(
         self, 
-        protocol: Dict[str, Any], 
-        health_data: Dict[str, Any], 
-        alert_type: str
-    ) -> Dict[str, Any]:
+        protocol: Protocol, 
+        alert_type: str,
+        many_abnormal_vitals: bool,
+        night_time: bool,
+        elderly_patient: bool
+    ) -> Protocol:
         """Apply contextual modifications to response protocol"""
         
-        try:
-            # Multiple abnormal vitals increase urgency
-            abnormal_count = self._count_abnormal_vitals(health_data)
-            if abnormal_count >= 3:
-                protocol['escalation_levels'] += 1
-                protocol['response_time_seconds'] = max(30, protocol['response_time_seconds'] // 2)
-                protocol['require_immediate_consultation'] = True
-            
-            # Device-specific modifications
-            if alert_type == 'device_reading':
-                # Increase monitoring for device alerts
-                protocol['increase_monitoring'] = True
-                protocol['monitoring_duration_minutes'] = 120
-            
-            # Time-based modifications
-            current_hour = datetime.now().hour
-            if 22 <= current_hour or current_hour <= 6:  # Night hours
-                protocol['night_protocol'] = True
-                protocol['escalation_levels'] += 1
-                if not protocol.get('auto_call_ems', False):
-                    protocol['alert_healthcare_providers'] = True
-            
-            # Age-based modifications (would get from patient profile in production)
-            # For hackathon, we simulate based on baseline vitals
-            if self._is_elderly_patient(health_data):
-                protocol['elderly_patient'] = True
-                protocol['escalation_levels'] += 1
-                protocol['follow_up_intervals'] = [interval // 2 for interval in protocol['follow_up_intervals']]
-            
-            return protocol
-            
-        except Exception as e:
-            logger.error(f"Error applying contextual modifications: {str(e)}")
-            return protocol
+        # Multiple abnormal vitals increase urgency
+        if many_abnormal_vitals:
+            protocol.escalation_levels += 1
+            protocol.response_time_seconds = max(30, protocol.response_time_seconds // 2)
+            protocol.require_immediate_consultation = True
+        
+        # Device-specific modifications
+        if alert_type == 'device_reading':
+            # Increase monitoring for device alerts
+            protocol.increase_monitoring = True
+            protocol.monitoring_duration_minutes = 120
+        
+        # Time-based modifications
+        if night_time:
+            protocol.night_protocol = True
+            protocol.escalation_levels += 1
+            if not protocol.auto_call_ems:
+                protocol.alert_healthcare_providers = True
+        
+        # Age-based modifications (would get from patient profile in production)
+        # For hackathon, we simulate based on baseline vitals
+        if elderly_patient:
+            protocol.elderly_patient = True
+            protocol.escalation_levels += 1
+            protocol.follow_up_intervals = tuple(interval // 2 for interval in protocol.follow_up_intervals)
+        
+        return protocol
     
-    def _count_abnormal_vitals(self, health_data: Dict[str, Any]) -> int:
+    def _count_abnormal_vitals(self, vitals: VitalsView) -> int:
         """Count number of abnormal vital signs"""
         
         abnormal_count = 0
         
         # Heart rate
-        if 'heart_rate' in health_data:
-            hr = health_data['heart_rate']
-            if hr < 50 or hr > 120:
-                abnormal_count += 1
+        hr = vitals.hr
+        if hr is not None and (hr < 50 or hr > 120):
+            abnormal_count += 1
         
         # Blood pressure
-        if 'blood_pressure' in health_data:
-            bp = health_data['blood_pressure']
-            systolic = bp.get('systolic', 120)
-            diastolic = bp.get('diastolic', 80)
+        systolic = vitals.sys
+        diastolic = vitals.dia
+        if systolic is not None and diastolic is not None:
             if systolic > 160 or systolic < 90 or diastolic > 100 or diastolic < 60:
                 abnormal_count += 1
         
         # Temperature
-        if 'core_temperature' in health_data:
-            temp = health_data['core_temperature']
-            if temp > 38.5 or temp < 35.5:
-                abnormal_count += 1
+        temp = vitals.temp
+        if temp is not None and (temp > 38.5 or temp < 35.5):
+            abnormal_count += 1
         
         # Oxygen saturation
-        if 'oxygen_saturation' in health_data:
-            spo2 = health_data['oxygen_saturation']
-            if spo2 < 92:
-                abnormal_count += 1
+        if vitals.spo2 is not None and vitals.spo2 < 92:
+            abnormal_count += 1
         
         # Respiratory rate
-        if 'respiratory_rate' in health_data:
-            rr = health_data['respiratory_rate']
-            if rr < 10 or rr > 24:
-                abnormal_count += 1
+        rr = vitals.rr
+        if rr is not None and (rr < 10 or rr > 24):
+            abnormal_count += 1
         
         # Glucose
-        if 'glucose_level' in health_data:
-            glucose = health_data['glucose_level']
-            if glucose < 70 or glucose > 200:
-                abnormal_count += 1
+        glucose = vitals.glucose
+        if glucose is not None and (glucose < 70 or glucose > 200):
+            abnormal_count += 1
         
         return abnormal_count
     
@@ -338,30 +539,41 @@ class EmergencyAlertSystem:
         
         elderly_indicators = 0
         
+        # Lower activity levels
+        steps = health_data.get('steps')
+        if steps is not None and steps < 3000:
+            elderly_indicators += 1
+        
         # Lower baseline heart rate
-        if 'heart_rate' in health_data and health_data['heart_rate'] < 65:
+        hr = health_data.get('heart_rate')
+        if hr is not None and hr < 65:
             elderly_indicators += 1
+            if elderly_indicators >= 2:
+                return True
         
         # Higher baseline blood pressure
-        if 'blood_pressure' in health_data:
-            bp = health_data['blood_pressure']
-            if bp.get('systolic', 120) > 140:
-                elderly_indicators += 1
-        
-        # Lower activity levels
-        if 'steps' in health_data and health_data['steps'] < 3000:
+        bp = health_data.get('blood_pressure') or {}
+        if bp.get('systolic', 120) > 140:
             elderly_indicators += 1
         
         return elderly_indicators >= 2
     
-    def calculate_risk_score(self, health_data: Dict[str, Any], alert_type: str) -> float:
+    def calculate_risk_score(
+        self, 
+        health_data: Dict[str, Any], 
+        alert_type: str, 
+        vitals: Optional[VitalsView] = None
+    ) -> float:
         """Calculate comprehensive risk score for emergency assessment"""
         
         try:
+            if vitals is None:
+                vitals = _build_view(health_data)
+            
             risk_score = 0.0
             
             # Vital signs risk assessment
-            vital_risk = self._assess_vital_signs_risk(health_data)
+            vital_risk = self._assess_vital_signs_risk(vitals)
             risk_score += vital_risk * 0.4
             
             # Trend analysis risk
@@ -369,7 +581,7 @@ class EmergencyAlertSystem:
             risk_score += trend_risk * 0.3
             
             # Combination risk (multiple abnormal values)
-            combination_risk = self._assess_combination_risk(health_data)
+            combination_risk = self._assess_combination_risk(vitals)
             risk_score += combination_risk * 0.2
             
             # Alert type specific risk
@@ -382,58 +594,18 @@ class EmergencyAlertSystem:
             return round(risk_score, 3)
             
         except Exception as e:
-            logger.error(f"Error calculating risk score: {str(e)}")
+            logger.error("Error calculating risk score: %s", e)
             return 0.5  # Default moderate risk
     
-    def _assess_vital_signs_risk(self, health_data: Dict[str, Any]) -> float:
+    def _assess_vital_signs_risk(self, vitals: VitalsView) -> float:
         """Assess risk based on individual vital signs"""
         
-        max_risk = 0.0
-        
-        # Heart rate risk
-        if 'heart_rate' in health_data:
-            hr = health_data['heart_rate']
-            if hr < 30 or hr > 180:
-                max_risk = max(max_risk, 1.0)
-            elif hr < 40 or hr > 150:
-                max_risk = max(max_risk, 0.8)
-            elif hr < 50 or hr > 120:
-                max_risk = max(max_risk, 0.4)
-        
-        # Blood pressure risk
-        if 'blood_pressure' in health_data:
-            bp = health_data['blood_pressure']
-            systolic = bp.get('systolic', 120)
-            diastolic = bp.get('diastolic', 80)
-            
-            if systolic > 220 or diastolic > 130 or systolic < 70:
-                max_risk = max(max_risk, 1.0)
-            elif systolic > 180 or diastolic > 110 or systolic < 90:
-                max_risk = max(max_risk, 0.7)
-            elif systolic > 160 or diastolic > 100:
-                max_risk = max(max_risk, 0.4)
-        
-        # Temperature risk
-        if 'core_temperature' in health_data:
-            temp = health_data['core_temperature']
-            if temp > 41.0 or temp < 34.0:
-                max_risk = max(max_risk, 1.0)
-            elif temp > 39.5 or temp < 35.0:
-                max_risk = max(max_risk, 0.6)
-            elif temp > 38.5 or temp < 36.0:
-                max_risk = max(max_risk, 0.3)
-        
-        # Oxygen saturation risk
-        if 'oxygen_saturation' in health_data:
-            spo2 = health_data['oxygen_saturation']
-            if spo2 < 80:
-                max_risk = max(max_risk, 1.0)
-            elif spo2 < 88:
-                max_risk = max(max_risk, 0.8)
-            elif spo2 < 92:
-                max_risk = max(max_risk, 0.4)
-        
-        return max_risk
+        return max(
+            _hr_risk(vitals.hr),
+            _bp_risk(vitals.sys, vitals.dia),
+            _temp_risk(vitals.temp),
+            _spo2_risk(vitals.spo2)
+        )
     
     def _assess_trend_risk(self, health_data: Dict[str, Any]) -> float:
         """Assess risk based on trends in health data"""
@@ -462,10 +634,10 @@ class EmergencyAlertSystem:
         
         return min(1.0, trend_risk)
     
-    def _assess_combination_risk(self, health_data: Dict[str, Any]) -> float:
+    def _assess_combination_risk(self, vitals: VitalsView) -> float:
         """Assess risk based on combination of abnormal values"""
         
-        abnormal_count = self._count_abnormal_vitals(health_data)
+        abnormal_count = self._count_abnormal_vitals(vitals)
         
         if abnormal_count >= 4:
             return 1.0
@@ -494,26 +666,30 @@ class EmergencyAlertSystem:
     def generate_emergency_summary(
         self, 
         alert_record: Dict[str, Any], 
-        protocol: Dict[str, Any]
+        protocol: Protocol
     ) -> Dict[str, Any]:
-        """Generate comprehensive emergency summary for responders"""[2]
+        """Generate comprehensive emergency summary for responders"""
         
         try:
+            health_data = alert_record.get('health_data', {})
+            vitals = _build_view(health_data)
+            
             summary = {
                 'alert_id': alert_record['alert_id'],
                 'patient_id': alert_record['patient_id'],
-                'emergency_classification': protocol.get('emergency_classification', 'unclassified'),
-                'medical_code': protocol.get('medical_code', 'General Emergency'),
+                'emergency_classification': protocol.emergency_classification or 'unclassified',
+                'medical_code': protocol.medical_code or 'General Emergency',
                 'urgency_level': alert_record['urgency_level'],
                 'risk_score': self.calculate_risk_score(
-                    alert_record.get('health_data', {}), 
-                    alert_record['alert_type']
+                    health_data, 
+                    alert_record['alert_type'],
+                    vitals
                 ),
-                'critical_vitals': self._extract_critical_vitals(alert_record.get('health_data', {})),
+                'critical_vitals': self._extract_critical_vitals(vitals),
                 'recommended_actions': self._generate_recommended_actions(protocol),
-                'estimated_response_time': f"{protocol['response_time_seconds']} seconds",
-                'ems_required': protocol.get('auto_call_ems', False),
-                'consultation_required': protocol.get('require_immediate_consultation', False),
+                'estimated_response_time': f"{protocol.response_time_seconds} seconds",
+                'ems_required': protocol.auto_call_ems,
+                'consultation_required': protocol.require_immediate_consultation,
                 'monitoring_instructions': self._generate_monitoring_instructions(protocol),
                 'escalation_plan': self._generate_escalation_plan(protocol),
                 'generated_at': datetime.now(timezone.utc).isoformat()
@@ -522,69 +698,52 @@ class EmergencyAlertSystem:
             return summary
             
         except Exception as e:
-            logger.error(f"Error generating emergency summary: {str(e)}")
+            logger.error("Error generating emergency summary: %s", e)
             return {
                 'alert_id': alert_record.get('alert_id', 'unknown'),
                 'error': 'Failed to generate emergency summary',
                 'generated_at': datetime.now(timezone.utc).isoformat()
             }
     
-    def _extract_critical_vitals(self, health_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _extract_critical_vitals(self, vitals: VitalsView) -> List[Dict[str, Any]]:
         """Extract critical vital signs from health data"""
         
         critical_vitals = []
         
-        # Define critical thresholds
-        critical_thresholds = {
-            'heart_rate': {'min': 40, 'max': 150},
-            'systolic_pressure': {'min': 80, 'max': 200},
-            'diastolic_pressure': {'min': 50, 'max': 120},
-            'core_temperature': {'min': 35.0, 'max': 39.5},
-            'oxygen_saturation': {'min': 88, 'max': 100},
-            'respiratory_rate': {'min': 8, 'max': 30},
-            'glucose_level': {'min': 60, 'max': 300}
-        }
-        
-        for vital, thresholds in critical_thresholds.items():
-            if vital in health_data:
-                value = health_data[vital]
-                if vital == 'systolic_pressure' and 'blood_pressure' in health_data:
-                    value = health_data['blood_pressure'].get('systolic')
-                elif vital == 'diastolic_pressure' and 'blood_pressure' in health_data:
-                    value = health_data['blood_pressure'].get('diastolic')
-                
-                if value and (value < thresholds['min'] or value > thresholds['max']):
-                    critical_vitals.append({
-                        'vital_sign': vital,
-                        'value': value,
-                        'normal_range': f"{thresholds['min']}-{thresholds['max']}",
-                        'severity': 'critical' if (
-                            value < thresholds['min'] * 0.8 or 
-                            value > thresholds['max'] * 1.2
-                        ) else 'abnormal'
-                    })
+        for vital, attr, low, high, normal_range, critical_min, critical_max in _CRITICAL_THRESHOLDS:
+            value = getattr(vitals, attr)
+            if value is None:
+                continue
+            
+            if value < low or value > high:
+                critical_vitals.append({
+                    'vital_sign': vital,
+                    'value': value,
+                    'normal_range': normal_range,
+                    'severity': 'critical' if (value < critical_min or value > critical_max) else 'abnormal'
+                })
         
         return critical_vitals
     
-    def _generate_recommended_actions(self, protocol: Dict[str, Any]) -> List[str]:
+    def _generate_recommended_actions(self, protocol: Protocol) -> List[str]:
         """Generate recommended immediate actions"""
         
         actions = []
         
-        if protocol.get('auto_call_ems', False):
+        if protocol.auto_call_ems:
             actions.append("Call Emergency Medical Services (911) immediately")
         
-        if protocol.get('require_immediate_consultation', False):
+        if protocol.require_immediate_consultation:
             actions.append("Initiate immediate medical consultation")
         
-        if protocol.get('notify_emergency_contacts', False):
+        if protocol.notify_emergency_contacts:
             actions.append("Notify emergency contacts")
         
-        if protocol.get('increase_monitoring', False):
+        if protocol.increase_monitoring:
             actions.append("Increase patient monitoring frequency")
         
-        if protocol.get('emergency_classification'):
-            classification = protocol['emergency_classification']
+        if protocol.emergency_classification:
+            classification = protocol.emergency_classification
             if classification == 'cardiac_arrest':
                 actions.extend([
                     "Begin CPR if patient is unresponsive",
@@ -614,58 +773,17 @@ class EmergencyAlertSystem:
         
         return actions
     
-    def _generate_monitoring_instructions(self, protocol: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_monitoring_instructions(self, protocol: Protocol) -> Dict[str, Any]:
         """Generate monitoring instructions"""
         
-        instructions = {
-            'frequency': 'every 5 minutes' if protocol.get('increase_monitoring') else 'every 15 minutes',
-            'duration': f"{protocol.get('monitoring_duration_minutes', 60)} minutes",
-            'parameters': [
-                'Heart rate and rhythm',
-                'Blood pressure',
-                'Respiratory rate',
-                'Oxygen saturation',
-                'Level of consciousness',
-                'Temperature'
-            ],
-            'alert_conditions': [
-                'Any vital sign deterioration',
-                'Loss of consciousness',
-                'Difficulty breathing',
-                'Chest pain',
-                'Severe headache',
-                'Confusion or disorientation'
-            ]
+        return {
+            'frequency': 'every 5 minutes' if protocol.increase_monitoring else 'every 15 minutes',
+            'duration': f"{protocol.monitoring_duration_minutes or 60} minutes",
+            'parameters': _MONITORING_PARAMETERS,
+            'alert_conditions': _MONITORING_ALERT_CONDITIONS
         }
-        
-        return instructions
     
-    def _generate_escalation_plan(self, protocol: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_escalation_plan(self, protocol: Protocol) -> List[Dict[str, Any]]:
         """Generate escalation plan"""
         
-        escalation_plan = []
-        
-        for level in range(1, protocol.get('escalation_levels', 1) + 1):
-            if level == 1:
-                escalation_plan.append({
-                    'level': 1,
-                    'trigger': 'Initial alert',
-                    'actions': ['Notify emergency contacts', 'Begin monitoring'],
-                    'timeframe': 'Immediate'
-                })
-            elif level == 2:
-                escalation_plan.append({
-                    'level': 2,
-                    'trigger': 'No improvement in 10 minutes',
-                    'actions': ['Alert healthcare providers', 'Consider EMS'],
-                    'timeframe': '10 minutes'
-                })
-            elif level == 3:
-                escalation_plan.append({
-                    'level': 3,
-                    'trigger': 'Deterioration or no response',
-                    'actions': ['Call EMS immediately', 'Prepare for transport'],
-                    'timeframe': '15 minutes'
-                })
-        
-        return escalation_plan
+        return list(_ESCALATION_PLAN[:protocol.escalation_levels])
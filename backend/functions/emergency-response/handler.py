@@ -1,34 +1,193 @@
-import json
+import base64
 import logging
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
+from decimal import Decimal
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from alert_system import EmergencyAlertSystem
+from alert_system import EmergencyAlertSystem, Protocol
 from notification_service import NotificationService
 import uuid
-import traceback
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 
 # Configure logging
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-sns = boto3.client('sns')
-eventbridge = boto3.client('events')
-lambda_client = boto3.client('lambda')
-ses = boto3.client('ses')
+# Keep sockets alive between warm invocations and size the pool for the
+# notification thread pool's concurrent calls. Every request is built by
+# this module, so client-side parameter validation is skipped; malformed
+# input still fails with the service's ValidationException.
+AWS_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=64,
+    parameter_validation=False,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+# Initialize AWS clients (SMS/email/push clients live on NOTIFICATION_SERVICE)
+dynamodb = boto3.resource('dynamodb', config=AWS_CONFIG)
+eventbridge = boto3.client('events', config=AWS_CONFIG)
+scheduler = boto3.client('scheduler', config=AWS_CONFIG)
 
 # Environment variables
 EMERGENCY_ALERTS_TABLE = os.environ['EMERGENCY_ALERTS_TABLE']
 EMERGENCY_CONTACTS_TABLE = os.environ['EMERGENCY_CONTACTS_TABLE']
+FOLLOW_UP_FUNCTION_ARN = os.environ.get('FOLLOW_UP_FUNCTION_ARN')
+FOLLOW_UP_SCHEDULER_ROLE_ARN = os.environ.get('FOLLOW_UP_SCHEDULER_ROLE_ARN')
+FOLLOW_UP_SCHEDULE_GROUP = os.environ.get('FOLLOW_UP_SCHEDULE_GROUP', 'default')
 EMERGENCY_TOPIC_ARN = os.environ['EMERGENCY_TOPIC_ARN']
 EVENT_BUS_NAME = os.environ['EVENT_BUS_NAME']
-CONSULTATION_FUNCTION_ARN = os.environ['CONSULTATION_FUNCTION_ARN']
 TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN')
+DAX_ENDPOINT = os.environ.get('DAX_ENDPOINT')
+
+# Alert table GSIs as (index name, partition key), most selective first;
+# all are sorted by created_at
+ALERT_INDEXES = (
+    ('PatientIndex', 'patient_id'),
+    ('StatusIndex', 'status'),
+    ('UrgencyIndex', 'urgency_level')
+)
+
+# Unfiltered listings read BucketIndex (bucket = ISO year-week of created_at)
+# instead of scanning; six weeks covers the 30-day TTL window
+ALERT_BUCKET_FORMAT = '%G-%V'
+ALERT_BUCKET_WEEKS = 6
+
+# Filtered alert queries start with small pages so the first matches come
+# back quickly, doubling the page size while pages yield no matches
+QUERY_PAGE_MIN = 16
+QUERY_PAGE_MAX = 1024
+
+# Alert listings return at most this many rows per request
+ALERT_LIST_DEFAULT = 50
+ALERT_LIST_CAP = 100
+
+# Read units one listing query may consume before it returns early with a
+# cursor; keeps selective filters from paging into the Lambda timeout
+ALERT_QUERY_RCU_CAP = 50
+
+# Fields a manual emergency request must carry
+MANUAL_EMERGENCY_REQUIRED = frozenset({'patient_id', 'emergency_type'})
+
+# Columns returned by alert listings; response_actions, notifications_sent
+# and health_data stay behind unless the caller fetches the full alert
+ALERT_LIST_PROJECTION = 'alert_id, patient_id, #s, urgency_level, alert_type, severity_score, created_at'
+
+# Shared by every API Gateway response; must stay a plain dict so the
+# Lambda runtime can serialize it
+CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+# PutEvents accepts at most 10 entries per call
+EVENT_BATCH_SIZE = 10
+EVENT_PUT_ATTEMPTS = 3
+
+# Prebuilt EventBridge entry fields per event type; only Detail varies
+CONSULTATION_EVENT = {
+    'Source': 'healthconnect.emergency',
+    'DetailType': 'Emergency Consultation Request',
+    'EventBusName': EVENT_BUS_NAME
+}
+MONITORING_EVENT = {
+    'Source': 'healthconnect.emergency',
+    'DetailType': 'Increase Device Monitoring',
+    'EventBusName': EVENT_BUS_NAME
+}
+RESPONSE_COMPLETE_EVENT = {
+    'Source': 'healthconnect.emergency',
+    'DetailType': 'Emergency Response Complete',
+    'EventBusName': EVENT_BUS_NAME
+}
+
+# Table handles are resolved once per container and reused
+EMERGENCY_ALERTS = dynamodb.Table(EMERGENCY_ALERTS_TABLE)
+EMERGENCY_CONTACTS = dynamodb.Table(EMERGENCY_CONTACTS_TABLE)
+
+# Alert listings and status updates go through DAX when DAX_ENDPOINT is
+# set, which requires the function to run in the cluster's VPC (unset by
+# default); updates write through so its item cache stays current. New
+# alerts are written to DynamoDB directly and reach cached listings once
+# the cluster's query TTL lapses, so keep that TTL to a few seconds.
+if DAX_ENDPOINT:
+    from amazondax import AmazonDaxClient
+    EMERGENCY_ALERTS_CACHED = AmazonDaxClient.resource(endpoint_url=DAX_ENDPOINT).Table(EMERGENCY_ALERTS_TABLE)
+else:
+    EMERGENCY_ALERTS_CACHED = EMERGENCY_ALERTS
+
+# Initialize emergency systems once per container; both are stateless after
+# construction (boto3 clients are thread-safe) so warm invocations reuse them
+ALERT_SYSTEM = EmergencyAlertSystem()
+NOTIFICATION_SERVICE = NotificationService()
+
+# Shared pool for fanning out blocking SMS/email/EventBridge calls
+EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# Device reading rules: (health_data key, unit, tiers). Tiers are checked in
+# order and the first whose (low, high) range the reading falls outside of
+# adds its score. Blood pressure has no tiers and is scored separately.
+VITAL_RULES = (
+    ('heart_rate', ' bpm', (
+        (40, 150, 0.4, 'Critical heart rate'),
+        (50, 120, 0.2, 'Abnormal heart rate'),
+    )),
+    ('blood_pressure', ' mmHg', None),
+    ('core_temperature', '°C', (
+        (34.0, 40.0, 0.4, 'Critical temperature'),
+        (35.0, 39.0, 0.2, 'Abnormal temperature'),
+    )),
+    ('oxygen_saturation', '%', (
+        (85, float('inf'), 0.5, 'Critical hypoxemia'),
+        (90, float('inf'), 0.3, 'Severe hypoxemia'),
+        (95, float('inf'), 0.1, 'Mild hypoxemia'),
+    )),
+    ('glucose_level', ' mg/dL', (
+        (50, 400, 0.4, 'Critical glucose'),
+        (70, 300, 0.2, 'Abnormal glucose'),
+    )),
+    ('respiratory_rate', ' breaths/min', (
+        (8, 30, 0.3, 'Critical respiratory rate'),
+        (10, 25, 0.1, 'Abnormal respiratory rate'),
+    )),
+)
+
+# orjson returns bytes; API Gateway bodies and EventBridge details need str
+_loads = orjson.loads
+
+def _json_default(value: Any) -> Any:
+    """Render DynamoDB Decimals as JSON numbers; anything else as str"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return str(value)
+
+def _dumps(obj: Any, option: Optional[int] = None) -> str:
+    """Serialize to a JSON string"""
+    return orjson.dumps(obj, default=_json_default, option=option).decode()
+
+def _resp(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an API Gateway proxy response with a JSON body"""
+    return {'statusCode': status_code, 'headers': CORS_HEADERS, 'body': _dumps(body)}
+
+def strip_empty_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop None/empty top-level attributes; DynamoDB bills writes per 1KB"""
+    return {k: v for k, v in record.items() if v not in (None, {}, [], '')}
+
+def to_dynamodb(value: Any) -> Any:
+    """Convert floats to Decimal; boto3's DynamoDB serializer rejects float"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: to_dynamodb(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_dynamodb(v) for v in value]
+    return value
 
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
@@ -42,64 +201,61 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         Dict containing response status and emergency response details
     """
     try:
-        # Determine event source
+        # Determine event source, most frequent first
         if 'Records' in event:
             # SNS trigger
             return handle_sns_emergency_alert(event, context)
-        elif 'source' in event and event['source'] == 'healthconnect.analysis':
-            # EventBridge trigger from health analysis
-            return handle_health_analysis_alert(event, context)
-        elif 'source' in event and event['source'] == 'healthconnect.devices':
-            # EventBridge trigger from device alerts
-            return handle_device_alert(event, context)
         elif 'httpMethod' in event:
             # API Gateway trigger
             return handle_api_request(event, context)
-        else:
-            # Direct invocation
-            return handle_direct_emergency(event, context)
+        
+        # EventBridge triggers, keyed by event source
+        eventbridge_handler = EVENTBRIDGE_HANDLERS.get(event.get('source'))
+        if eventbridge_handler:
+            return eventbridge_handler(event, context)
+        
+        # Direct invocation
+        return handle_direct_emergency(event, context)
             
-    except Exception as e:
-        logger.error(f"Error in emergency response handler: {str(e)}")
-        logger.error(traceback.format_exc())
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'error': 'Emergency response system error',
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        }
+    except Exception:
+        logger.exception("Error in emergency response handler")
+        return _resp(500, {
+            'error': 'Emergency response system error',
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        })
 
 def handle_sns_emergency_alert(event: Dict[str, Any], context) -> Dict[str, Any]:
     """Handle emergency alerts from SNS"""
     try:
         processed_alerts = 0
         
+        # Collect every record's EventBridge entries and publish them together
+        events_to_emit = []
+        
         for record in event['Records']:
             if record['EventSource'] == 'aws:sns':
-                message = json.loads(record['Sns']['Message'])
+                message = _loads(record['Sns']['Message'])
                 
                 # Process emergency alert
-                alert_response = process_emergency_alert(message)
+                alert_response = process_emergency_alert(message, events_to_emit)
                 
                 if alert_response['success']:
                     processed_alerts += 1
-                    logger.info(f"Processed emergency alert: {alert_response['alert_id']}")
+                    logger.info("Processed emergency alert: %s", alert_response['alert_id'])
                 else:
-                    logger.error(f"Failed to process emergency alert: {alert_response.get('error')}")
+                    logger.error("Failed to process emergency alert: %s", alert_response.get('error'))
+        
+        failed_event_count = emit_emergency_events(events_to_emit)
         
         return {
             'statusCode': 200,
             'processed_alerts': processed_alerts,
+            'failed_event_count': failed_event_count,
             'timestamp': datetime.now(timezone.utc).isoformat()
         }
         
     except Exception as e:
-        logger.error(f"Error handling SNS emergency alert: {str(e)}")
+        logger.error("Error handling SNS emergency alert: %s", e)
         raise
 
 def handle_health_analysis_alert(event: Dict[str, Any], context) -> Dict[str, Any]:
@@ -130,14 +286,14 @@ def handle_health_analysis_alert(event: Dict[str, Any], context) -> Dict[str, An
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
         else:
-            logger.info(f"Non-emergency health analysis for patient {patient_id}")
+            logger.info("Non-emergency health analysis for patient %s", patient_id)
             return {
                 'statusCode': 200,
                 'message': 'Non-emergency alert - no action taken'
             }
             
     except Exception as e:
-        logger.error(f"Error handling health analysis alert: {str(e)}")
+        logger.error("Error handling health analysis alert: %s", e)
         raise
 
 def handle_device_alert(event: Dict[str, Any], context) -> Dict[str, Any]:
@@ -173,94 +329,109 @@ def handle_device_alert(event: Dict[str, Any], context) -> Dict[str, Any]:
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
         else:
-            logger.info(f"Non-emergency device reading from {device_id}")
+            logger.info("Non-emergency device reading from %s", device_id)
             return {
                 'statusCode': 200,
                 'message': 'Non-emergency device alert - monitoring continues'
             }
             
     except Exception as e:
-        logger.error(f"Error handling device alert: {str(e)}")
+        logger.error("Error handling device alert: %s", e)
         raise
 
+def _json_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse an API Gateway JSON body"""
+    return _loads(event['body']) if event.get('body') else {}
+
+def _limit(query_params: Dict[str, Any], default: int = ALERT_LIST_DEFAULT, cap: int = ALERT_LIST_CAP) -> int:
+    """Parse the limit query parameter, clamped to [1, cap]"""
+    try:
+        limit = int(query_params.get('limit', default))
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, cap))
+
+def _encode_token(key: Dict[str, Any]) -> str:
+    """Encode a DynamoDB start key as an opaque pagination token"""
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode()
+
+def _decode_token(token: str) -> Dict[str, Any]:
+    """Decode a pagination token back into a DynamoDB start key"""
+    key = _loads(base64.urlsafe_b64decode(token))
+    if not isinstance(key, dict) or 'alert_id' not in key:
+        raise ValueError('Malformed pagination token')
+    return key
+
+# (HTTP method, last path segment) -> API handler. Keying on the last
+# segment keeps stage or custom-domain base path prefixes working.
+API_ROUTES = {
+    # Manual emergency trigger
+    ('POST', 'emergency'): lambda event: handle_manual_emergency(_json_body(event)),
+    # Get emergency alerts
+    ('GET', 'alerts'): lambda event: get_emergency_alerts(event.get('queryStringParameters') or {}),
+    # Update alert status
+    ('PUT', 'alerts'): lambda event: update_alert_status(_json_body(event)),
+    # Test emergency system
+    ('POST', 'test'): lambda event: test_emergency_system()
+}
+
 def handle_api_request(event: Dict[str, Any], context) -> Dict[str, Any]:
     """Handle API Gateway requests"""
     try:
-        http_method = event['httpMethod']
-        path = event['path']
+        segment = event['path'].rstrip('/').rsplit('/', 1)[-1]
+        route = API_ROUTES.get((event['httpMethod'], segment))
         
-        if http_method == 'POST' and '/emergency' in path:
-            # Manual emergency trigger
-            body = json.loads(event['body']) if event.get('body') else {}
-            return handle_manual_emergency(body)
-            
-        elif http_method == 'GET' and '/alerts' in path:
-            # Get emergency alerts
-            query_params = event.get('queryStringParameters', {}) or {}
-            return get_emergency_alerts(query_params)
-            
-        elif http_method == 'PUT' and '/alerts' in path:
-            # Update alert status
-            body = json.loads(event['body']) if event.get('body') else {}
-            return update_alert_status(body)
-            
-        elif http_method == 'POST' and '/test' in path:
-            # Test emergency system
-            return test_emergency_system()
-            
+        if route:
+            return route(event)
         else:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'Endpoint not found'})
-            }
+            return _resp(404, {'error': 'Endpoint not found'})
             
     except Exception as e:
-        logger.error(f"Error handling API request: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': 'Internal server error'})
-        }
+        logger.error("Error handling API request: %s", e)
+        return _resp(500, {'error': 'Internal server error'})
 
 def handle_direct_emergency(event: Dict[str, Any], context) -> Dict[str, Any]:
     """Handle direct emergency invocation"""
     try:
         alert_response = process_emergency_alert(event)
         
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'alert_processed': alert_response['success'],
-                'alert_id': alert_response.get('alert_id'),
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        }
+        return _resp(200, {
+            'alert_processed': alert_response['success'],
+            'alert_id': alert_response.get('alert_id'),
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        })
         
     except Exception as e:
-        logger.error(f"Error handling direct emergency: {str(e)}")
+        logger.error("Error handling direct emergency: %s", e)
         raise
 
-def process_emergency_alert(emergency_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Process emergency alert and coordinate response"""
+# EventBridge source -> handler
+EVENTBRIDGE_HANDLERS = {
+    'healthconnect.analysis': handle_health_analysis_alert,
+    'healthconnect.devices': handle_device_alert
+}
+
+def process_emergency_alert(
+    emergency_data: Dict[str, Any],
+    events_to_emit: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Process emergency alert and coordinate response
+    
+    EventBridge entries are appended to events_to_emit when the caller
+    passes a list (and then owns publishing them); otherwise they are
+    published before returning. The completion event is only raised once
+    the alert is stored.
+    """
+    
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    now_ts = int(now.timestamp())
+    
     try:
         # Generate unique alert ID
         alert_id = str(uuid.uuid4())
         
-        # Initialize emergency systems
-        alert_system = EmergencyAlertSystem()
-        notification_service = NotificationService()
-        
         # Create emergency alert record
         alert_record = {
             'alert_id': alert_id,
@@ -273,35 +444,45 @@ def process_emergency_alert(emergency_data: Dict[str, Any]) -> Dict[str, Any]:
             'health_data': emergency_data.get('health_data', {}),
             'severity_score': emergency_data.get('severity_score', 0.8),
             'status': 'ACTIVE',
-            'created_at': datetime.now(timezone.utc).isoformat(),
-            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'created_at': now_iso,
+            'updated_at': now_iso,
+            'bucket': now.strftime(ALERT_BUCKET_FORMAT),
             'response_actions': [],
             'notifications_sent': [],
             'escalation_level': 1,
-            'ttl': int(datetime.now().timestamp()) + 2592000  # 30 days TTL
+            'ttl': now_ts + 2592000  # 30 days TTL
         }
         
-        # Store alert in DynamoDB
-        table = dynamodb.Table(EMERGENCY_ALERTS_TABLE)
-        table.put_item(Item=alert_record)
-        
         # Determine response protocol based on urgency
-        response_protocol = alert_system.determine_response_protocol(
+        response_protocol = ALERT_SYSTEM.determine_response_protocol(
             alert_record['urgency_level'],
             alert_record['alert_type'],
             alert_record.get('health_data', {})
         )
         
+        # EventBridge entries raised while responding (monitoring,
+        # consultation)
+        emit_events = events_to_emit is None
+        alert_events = []
+        
+        # Get emergency contacts once; both the immediate response and the
+        # notification fan-out reach the same people
+        emergency_contacts = get_emergency_contacts(alert_record['patient_id'])
+        
         # Execute immediate response actions
-        immediate_actions = execute_immediate_response(alert_record, response_protocol)
+        immediate_actions = execute_immediate_response(
+            alert_record, response_protocol, emergency_contacts, alert_events
+        )
         
         # Send notifications
-        notification_results = send_emergency_notifications(alert_record, response_protocol)
+        notification_results = send_emergency_notifications(
+            alert_record, response_protocol, emergency_contacts
+        )
         
         # Trigger emergency consultation if needed
         consultation_result = None
-        if response_protocol.get('require_immediate_consultation', False):
-            consultation_result = trigger_emergency_consultation(alert_record)
+        if response_protocol.require_immediate_consultation:
+            consultation_result = trigger_emergency_consultation(alert_record, alert_events)
         
         # Update alert record with response actions
         alert_record['response_actions'] = immediate_actions
@@ -309,32 +490,46 @@ def process_emergency_alert(emergency_data: Dict[str, Any]) -> Dict[str, Any]:
         alert_record['consultation_triggered'] = consultation_result is not None
         alert_record['updated_at'] = datetime.now(timezone.utc).isoformat()
         
-        # Update record in DynamoDB
-        table.put_item(Item=alert_record)
-        
-        # Send completion event
-        send_emergency_response_event(alert_record)
+        # Monitoring and consultation events and the follow-up schedule
+        # don't depend on the stored record, so they overlap with the write
+        pending_events = EXECUTOR.submit(emit_emergency_events, alert_events) if emit_events else None
+        pending_follow_up = EXECUTOR.submit(schedule_follow_up_actions, alert_record, response_protocol)
+        
+        # Store alert in DynamoDB once, with the response actions attached.
+        # The response helpers trap their own errors, so the record is
+        # always written even when an individual action fails.
+        EMERGENCY_ALERTS.put_item(Item=to_dynamodb(strip_empty_fields(alert_record)))
+        
+        # The completion event announces a stored alert, so it is only
+        # queued once the write has succeeded
+        completion_events = []
+        send_emergency_response_event(alert_record, completion_events)
+        if emit_events:
+            failed_event_count = emit_emergency_events(completion_events) + pending_events.result()
+        else:
+            events_to_emit.extend(alert_events + completion_events)
+            failed_event_count = 0
         
-        # Schedule follow-up actions
-        schedule_follow_up_actions(alert_record, response_protocol)
+        pending_follow_up.result()
         
-        logger.info(f"Emergency alert processed successfully: {alert_id}")
+        logger.info("Emergency alert processed successfully: %s", alert_id)
         
         return {
             'success': True,
             'alert_id': alert_id,
-            'response_protocol': response_protocol,
+            'response_protocol': response_protocol.to_dict(),
             'immediate_actions': immediate_actions,
             'notifications_sent': len(notification_results),
-            'consultation_triggered': consultation_result is not None
+            'consultation_triggered': consultation_result is not None,
+            'failed_event_count': failed_event_count
         }
         
     except Exception as e:
-        logger.error(f"Error processing emergency alert: {str(e)}")
+        logger.error("Error processing emergency alert: %s", e)
         return {
             'success': False,
             'error': str(e),
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
 
 def assess_device_emergency_severity(health_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -343,74 +538,28 @@ def assess_device_emergency_severity(health_data: Dict[str, Any]) -> Dict[str, A
     severity_score = 0.0
     critical_indicators = []
     
-    # Heart rate assessment
-    if 'heart_rate' in health_data:
-        hr = health_data['heart_rate']
-        if hr < 40 or hr > 150:
-            severity_score += 0.4
-            critical_indicators.append(f"Critical heart rate: {hr} bpm")
-        elif hr < 50 or hr > 120:
-            severity_score += 0.2
-            critical_indicators.append(f"Abnormal heart rate: {hr} bpm")
-    
-    # Blood pressure assessment
-    if 'blood_pressure' in health_data:
-        bp = health_data['blood_pressure']
-        systolic = bp.get('systolic', 120)
-        diastolic = bp.get('diastolic', 80)
-        
-        if systolic > 200 or diastolic > 120:
-            severity_score += 0.5
-            critical_indicators.append(f"Hypertensive crisis: {systolic}/{diastolic} mmHg")
-        elif systolic < 80 or diastolic < 50:
-            severity_score += 0.4
-            critical_indicators.append(f"Hypotensive crisis: {systolic}/{diastolic} mmHg")
-        elif systolic > 180 or diastolic > 110:
-            severity_score += 0.3
-            critical_indicators.append(f"Severe hypertension: {systolic}/{diastolic} mmHg")
-    
-    # Temperature assessment
-    if 'core_temperature' in health_data:
-        temp = health_data['core_temperature']
-        if temp > 40.0 or temp < 34.0:
-            severity_score += 0.4
-            critical_indicators.append(f"Critical temperature: {temp}°C")
-        elif temp > 39.0 or temp < 35.0:
-            severity_score += 0.2
-            critical_indicators.append(f"Abnormal temperature: {temp}°C")
-    
-    # Oxygen saturation assessment
-    if 'oxygen_saturation' in health_data:
-        spo2 = health_data['oxygen_saturation']
-        if spo2 < 85:
-            severity_score += 0.5
-            critical_indicators.append(f"Critical hypoxemia: {spo2}%")
-        elif spo2 < 90:
-            severity_score += 0.3
-            critical_indicators.append(f"Severe hypoxemia: {spo2}%")
-        elif spo2 < 95:
-            severity_score += 0.1
-            critical_indicators.append(f"Mild hypoxemia: {spo2}%")
-    
-    # Glucose assessment
-    if 'glucose_level' in health_data:
-        glucose = health_data['glucose_level']
-        if glucose > 400 or glucose < 50:
-            severity_score += 0.4
-            critical_indicators.append(f"Critical glucose: {glucose} mg/dL")
-        elif glucose > 300 or glucose < 70:
-            severity_score += 0.2
-            critical_indicators.append(f"Abnormal glucose: {glucose} mg/dL")
-    
-    # Respiratory rate assessment
-    if 'respiratory_rate' in health_data:
-        rr = health_data['respiratory_rate']
-        if rr > 30 or rr < 8:
-            severity_score += 0.3
-            critical_indicators.append(f"Critical respiratory rate: {rr} breaths/min")
-        elif rr > 25 or rr < 10:
-            severity_score += 0.1
-            critical_indicators.append(f"Abnormal respiratory rate: {rr} breaths/min")
+    for key, unit, tiers in VITAL_RULES:
+        value = health_data.get(key)
+        if value is None:
+            continue
+        
+        if tiers is None:
+            finding = assess_blood_pressure_severity(value)
+            if finding:
+                severity_score += finding[0]
+                critical_indicators.append(finding[1])
+        else:
+            for low, high, score, label in tiers:
+                if value < low or value > high:
+                    severity_score += score
+                    critical_indicators.append(f"{label}: {value}{unit}")
+                    break
+        
+        # Scores only add up, so once CRITICAL is reached the remaining vitals
+        # cannot change the outcome. The score and indicator list then only
+        # cover the vitals checked so far.
+        if severity_score >= 0.8:
+            break
     
     # Determine urgency level
     if severity_score >= 0.8:
@@ -432,137 +581,173 @@ def assess_device_emergency_severity(health_data: Dict[str, Any]) -> Dict[str, A
         'assessment_timestamp': datetime.now(timezone.utc).isoformat()
     }
 
-def execute_immediate_response(alert_record: Dict[str, Any], response_protocol: Dict[str, Any]) -> List[Dict[str, Any]]:
+def assess_blood_pressure_severity(bp: Dict[str, Any]) -> Optional[Tuple[float, str]]:
+    """Score a blood pressure reading; returns (score, indicator) or None"""
+    
+    systolic = bp.get('systolic', 120)
+    diastolic = bp.get('diastolic', 80)
+    
+    if systolic > 200 or diastolic > 120:
+        return 0.5, f"Hypertensive crisis: {systolic}/{diastolic} mmHg"
+    if systolic < 80 or diastolic < 50:
+        return 0.4, f"Hypotensive crisis: {systolic}/{diastolic} mmHg"
+    if systolic > 180 or diastolic > 110:
+        return 0.3, f"Severe hypertension: {systolic}/{diastolic} mmHg"
+    return None
+
+def execute_immediate_response(
+    alert_record: Dict[str, Any],
+    response_protocol: Protocol,
+    emergency_contacts: List[Dict[str, Any]],
+    events_to_emit: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
     """Execute immediate response actions"""
     
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     actions_taken = []
     
-    try:
-        # Auto-escalate to emergency services if critical
-        if alert_record['urgency_level'] == 'CRITICAL':
-            if response_protocol.get('auto_call_ems', False):
-                ems_result = initiate_ems_call(alert_record)
-                actions_taken.append({
-                    'action': 'ems_call_initiated',
-                    'result': ems_result,
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                })
-        
-        # Notify emergency contacts
-        if response_protocol.get('notify_emergency_contacts', True):
-            contact_results = notify_emergency_contacts(alert_record)
-            actions_taken.append({
-                'action': 'emergency_contacts_notified',
-                'contacts_reached': len(contact_results),
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        
-        # Alert healthcare providers
-        if response_protocol.get('alert_healthcare_providers', True):
-            provider_results = alert_healthcare_providers(alert_record)
+    # Each action blocks on network I/O, so run the enabled ones concurrently
+    # and collect them in submission order: (action, summary key, future)
+    pending = []
+    
+    # Auto-escalate to emergency services if critical
+    if alert_record['urgency_level'] == 'CRITICAL' and response_protocol.auto_call_ems:
+        pending.append(('ems_call_initiated', 'result',
+                        EXECUTOR.submit(initiate_ems_call, alert_record)))
+    
+    # Notify emergency contacts
+    if response_protocol.notify_emergency_contacts:
+        pending.append(('emergency_contacts_notified', 'contacts_reached',
+                        EXECUTOR.submit(notify_emergency_contacts, alert_record, emergency_contacts)))
+    
+    # Alert healthcare providers
+    if response_protocol.alert_healthcare_providers:
+        pending.append(('healthcare_providers_alerted', 'providers_notified',
+                        EXECUTOR.submit(alert_healthcare_providers, alert_record)))
+    
+    # Trigger device data collection
+    if response_protocol.increase_monitoring:
+        pending.append(('monitoring_increased', 'result',
+                        EXECUTOR.submit(increase_device_monitoring, alert_record, events_to_emit)))
+    
+    for action, summary_key, future in pending:
+        try:
+            result = future.result()
             actions_taken.append({
-                'action': 'healthcare_providers_alerted',
-                'providers_notified': len(provider_results),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'action': action,
+                summary_key: len(result) if isinstance(result, list) else result,
+                'timestamp': now_iso
             })
-        
-        # Trigger device data collection
-        if response_protocol.get('increase_monitoring', True):
-            monitoring_result = increase_device_monitoring(alert_record)
+        except Exception as e:
+            logger.error("Error executing immediate response %s: %s", action, e)
             actions_taken.append({
-                'action': 'monitoring_increased',
-                'result': monitoring_result,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'action': 'error_in_immediate_response',
+                'failed_action': action,
+                'error': str(e),
+                'timestamp': now_iso
             })
-        
-        logger.info(f"Executed {len(actions_taken)} immediate response actions")
-        
-    except Exception as e:
-        logger.error(f"Error executing immediate response: {str(e)}")
-        actions_taken.append({
-            'action': 'error_in_immediate_response',
-            'error': str(e),
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        })
+    
+    logger.info("Executed %s immediate response actions", len(actions_taken))
     
     return actions_taken
 
-def send_emergency_notifications(alert_record: Dict[str, Any], response_protocol: Dict[str, Any]) -> List[Dict[str, Any]]:
+def send_emergency_notifications(
+    alert_record: Dict[str, Any],
+    response_protocol: Protocol,
+    emergency_contacts: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
     """Send emergency notifications through multiple channels"""
     
-    notification_service = NotificationService()
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     notifications_sent = []
     
     try:
         patient_id = alert_record['patient_id']
         
-        # Get emergency contacts
-        emergency_contacts = get_emergency_contacts(patient_id)
-        
-        # Prepare notification content
-        notification_content = prepare_notification_content(alert_record)
+        # Submit every send up front and collect in order as (entry, future,
+        # position); position indexes into a bulk send's per-recipient list.
+        # Content for a channel is only built when someone will receive it.
+        pending = []
         
         # Send SMS notifications
-        if response_protocol.get('send_sms', True):
-            for contact in emergency_contacts:
-                if contact.get('phone_number'):
-                    sms_result = notification_service.send_sms(
-                        contact['phone_number'],
-                        notification_content['sms_message']
-                    )
-                    notifications_sent.append({
-                        'type': 'sms',
-                        'recipient': contact['name'],
-                        'phone': contact['phone_number'],
-                        'success': sms_result['success'],
-                        'timestamp': datetime.now(timezone.utc).isoformat()
-                    })
+        sms_contacts = [c for c in emergency_contacts if c.get('phone_number')] if response_protocol.send_sms else []
+        if sms_contacts:
+            sms_message = prepare_sms_message(alert_record)
+            # One batched SNS publish per 10 recipients; results come back
+            # per number in the same order
+            sms_future = EXECUTOR.submit(
+                NOTIFICATION_SERVICE.send_sms_batch,
+                [contact['phone_number'] for contact in sms_contacts],
+                sms_message
+            )
+            for position, contact in enumerate(sms_contacts):
+                pending.append(({
+                    'type': 'sms',
+                    'recipient': contact['name'],
+                    'phone': contact['phone_number']
+                }, sms_future, position))
         
         # Send email notifications
-        if response_protocol.get('send_email', True):
-            for contact in emergency_contacts:
-                if contact.get('email'):
-                    email_result = notification_service.send_email(
-                        contact['email'],
-                        notification_content['email_subject'],
-                        notification_content['email_body']
-                    )
-                    notifications_sent.append({
-                        'type': 'email',
-                        'recipient': contact['name'],
-                        'email': contact['email'],
-                        'success': email_result['success'],
-                        'timestamp': datetime.now(timezone.utc).isoformat()
-                    })
+        email_contacts = [c for c in emergency_contacts if c.get('email')] if response_protocol.send_email else []
+        if email_contacts:
+            email_subject, email_body = prepare_email_content(alert_record)
+            # One bulk SES call covers every recipient; it returns a result
+            # per address in the same order
+            email_future = EXECUTOR.submit(
+                NOTIFICATION_SERVICE.send_email_bulk,
+                [contact['email'] for contact in email_contacts],
+                email_subject,
+                email_body
+            )
+            for position, contact in enumerate(email_contacts):
+                pending.append(({
+                    'type': 'email',
+                    'recipient': contact['name'],
+                    'email': contact['email']
+                }, email_future, position))
         
         # Send push notifications
-        if response_protocol.get('send_push', True):
-            push_result = notification_service.send_push_notification(
-                patient_id,
-                notification_content['push_title'],
-                notification_content['push_message']
-            )
-            notifications_sent.append({
+        if response_protocol.send_push:
+            push_title, push_message = prepare_push_content(alert_record)
+            pending.append(({
                 'type': 'push',
-                'recipient': 'patient_app',
-                'success': push_result['success'],
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        
-        logger.info(f"Sent {len(notifications_sent)} emergency notifications")
+                'recipient': 'patient_app'
+            }, EXECUTOR.submit(
+                NOTIFICATION_SERVICE.send_push_notification,
+                patient_id,
+                push_title,
+                push_message
+            ), None))
+        
+        for entry, future, position in pending:
+            try:
+                result = future.result()
+                entry['success'] = (result if position is None else result[position])['success']
+            except Exception as e:
+                logger.error("Error sending %s notification: %s", entry['type'], e)
+                entry['success'] = False
+                entry['error'] = str(e)
+            entry['timestamp'] = now_iso
+            notifications_sent.append(entry)
+        
+        logger.info("Sent %s emergency notifications", len(notifications_sent))
         
     except Exception as e:
-        logger.error(f"Error sending emergency notifications: {str(e)}")
+        logger.error("Error sending emergency notifications: %s", e)
         notifications_sent.append({
             'type': 'error',
             'error': str(e),
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         })
     
     return notifications_sent
 
-def trigger_emergency_consultation(alert_record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Trigger emergency consultation with healthcare provider"""
+def trigger_emergency_consultation(alert_record: Dict[str, Any], events_to_emit: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Queue an emergency consultation request with healthcare provider"""
+    
+    now_iso = datetime.now(timezone.utc).isoformat()
     
     try:
         consultation_request = {
@@ -573,74 +758,76 @@ def trigger_emergency_consultation(alert_record: Dict[str, Any]) -> Optional[Dic
             'health_data': alert_record.get('health_data', {}),
             'priority': 'IMMEDIATE',
             'auto_triggered': True,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'alert_type': alert_record.get('alert_type'),
+            'severity_score': alert_record.get('severity_score'),
+            'timestamp': now_iso
         }
         
-        # Invoke consultation function
-        response = lambda_client.invoke(
-            FunctionName=CONSULTATION_FUNCTION_ARN,
-            InvocationType='Event',  # Asynchronous
-            Payload=json.dumps(consultation_request)
+        # Fire-and-forget via EventBridge; the consultation service's
+        # 'Emergency Consultation Request' rule invokes its handler
+        events_to_emit.append(
+            build_emergency_event(CONSULTATION_EVENT, consultation_request)
         )
         
-        logger.info(f"Emergency consultation triggered for alert {alert_record['alert_id']}")
+        logger.info("Emergency consultation triggered for alert %s", alert_record['alert_id'])
         
         return {
             'consultation_triggered': True,
-            'function_response': response['StatusCode'],
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
         
     except Exception as e:
-        logger.error(f"Error triggering emergency consultation: {str(e)}")
+        logger.error("Error triggering emergency consultation: %s", e)
         return {
             'consultation_triggered': False,
             'error': str(e),
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
 
 def get_emergency_contacts(patient_id: str) -> List[Dict[str, Any]]:
     """Get emergency contacts for a patient"""
     
     try:
-        table = dynamodb.Table(EMERGENCY_CONTACTS_TABLE)
-        
-        response = table.query(
+        # Only return the fields the notification paths read
+        response = EMERGENCY_CONTACTS.query(
             KeyConditionExpression='patient_id = :patient_id',
+            ProjectionExpression='#name, phone_number, email',
+            ExpressionAttributeNames={'#name': 'name'},
             ExpressionAttributeValues={':patient_id': patient_id}
         )
         
         return response.get('Items', [])
         
     except ClientError as e:
-        logger.error(f"Error getting emergency contacts: {str(e)}")
+        logger.error("Error getting emergency contacts: %s", e)
         return []
 
-def prepare_notification_content(alert_record: Dict[str, Any]) -> Dict[str, str]:
-    """Prepare notification content for different channels"""
+def prepare_sms_message(alert_record: Dict[str, Any]) -> str:
+    """Prepare the short SMS notification text"""
+    
+    return (
+        f"EMERGENCY ALERT: {alert_record['urgency_level']} health alert for patient {alert_record['patient_id']}. "
+        f"Alert type: {alert_record['alert_type']}. Time: {alert_record['created_at']}. Please respond immediately."
+    )
+
+def prepare_email_content(alert_record: Dict[str, Any]) -> Tuple[str, str]:
+    """Prepare the email subject and detailed body"""
     
     patient_id = alert_record['patient_id']
     urgency_level = alert_record['urgency_level']
-    alert_type = alert_record['alert_type']
-    timestamp = alert_record['created_at']
     
-    # SMS message (short)
-    sms_message = f"EMERGENCY ALERT: {urgency_level} health alert for patient {patient_id}. Alert type: {alert_type}. Time: {timestamp}. Please respond immediately."
-    
-    # Email subject
     email_subject = f"URGENT: {urgency_level} Health Emergency Alert - Patient {patient_id}"
     
-    # Email body (detailed)
     email_body = f"""
 EMERGENCY HEALTH ALERT
 
 Patient ID: {patient_id}
 Alert Level: {urgency_level}
-Alert Type: {alert_type}
-Timestamp: {timestamp}
+Alert Type: {alert_record['alert_type']}
+Timestamp: {alert_record['created_at']}
 
 Health Data:
-{json.dumps(alert_record.get('health_data', {}), indent=2)}
+{_dumps(alert_record.get('health_data', {}), orjson.OPT_INDENT_2)}
 
 This is an automated emergency alert from HealthConnect AI. 
 Please take immediate action and contact emergency services if necessary.
@@ -648,21 +835,21 @@ Please take immediate action and contact emergency services if necessary.
 Alert ID: {alert_record['alert_id']}
 """
     
-    # Push notification
-    push_title = f"{urgency_level} Health Alert"
-    push_message = f"Emergency detected: {alert_type}. Please check your health status immediately."
+    return email_subject, email_body
+
+def prepare_push_content(alert_record: Dict[str, Any]) -> Tuple[str, str]:
+    """Prepare the push notification title and message"""
     
-    return {
-        'sms_message': sms_message,
-        'email_subject': email_subject,
-        'email_body': email_body,
-        'push_title': push_title,
-        'push_message': push_message
-    }
+    push_title = f"{alert_record['urgency_level']} Health Alert"
+    push_message = f"Emergency detected: {alert_record['alert_type']}. Please check your health status immediately."
+    
+    return push_title, push_message
 
 def initiate_ems_call(alert_record: Dict[str, Any]) -> Dict[str, Any]:
     """Initiate emergency medical services call (simulation for hackathon)"""
     
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     # In production, this would integrate with actual EMS systems
     # For hackathon, we simulate the call
     
@@ -673,63 +860,64 @@ def initiate_ems_call(alert_record: Dict[str, Any]) -> Dict[str, Any]:
             'location': 'Patient registered address',  # Would get from patient profile
             'medical_condition': alert_record.get('health_data', {}),
             'urgency_level': alert_record['urgency_level'],
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
         
         # Log EMS call for demonstration
-        logger.info(f"EMS CALL INITIATED: {json.dumps(ems_data, indent=2)}")
+        logger.info("EMS CALL INITIATED: %s", _dumps(ems_data, orjson.OPT_INDENT_2))
         
         return {
             'ems_call_initiated': True,
             'call_id': str(uuid.uuid4()),
             'estimated_arrival': '8-12 minutes',
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
         
     except Exception as e:
-        logger.error(f"Error initiating EMS call: {str(e)}")
+        logger.error("Error initiating EMS call: %s", e)
         return {
             'ems_call_initiated': False,
             'error': str(e),
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
 
-def notify_emergency_contacts(alert_record: Dict[str, Any]) -> List[Dict[str, Any]]:
+def notify_emergency_contacts(alert_record: Dict[str, Any], emergency_contacts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Notify emergency contacts"""
     
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     try:
         patient_id = alert_record['patient_id']
-        emergency_contacts = get_emergency_contacts(patient_id)
         
         contact_results = []
-        notification_service = NotificationService()
         
-        for contact in emergency_contacts:
-            if contact.get('phone_number'):
-                # Send SMS to emergency contact
-                message = f"EMERGENCY: {alert_record['urgency_level']} health alert for {patient_id}. Please respond immediately."
-                
-                sms_result = notification_service.send_sms(
-                    contact['phone_number'],
-                    message
-                )
-                
-                contact_results.append({
-                    'contact_name': contact.get('name', 'Unknown'),
-                    'contact_phone': contact['phone_number'],
-                    'notification_sent': sms_result['success'],
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                })
+        # Same text for every contact, so it goes out as one batched send
+        message = f"EMERGENCY: {alert_record['urgency_level']} health alert for {patient_id}. Please respond immediately."
+        sms_contacts = [contact for contact in emergency_contacts if contact.get('phone_number')]
+        sms_results = NOTIFICATION_SERVICE.send_sms_batch(
+            [contact['phone_number'] for contact in sms_contacts],
+            message
+        ) if sms_contacts else []
+        
+        for contact, sms_result in zip(sms_contacts, sms_results):
+            contact_results.append({
+                'contact_name': contact.get('name', 'Unknown'),
+                'contact_phone': contact['phone_number'],
+                'notification_sent': sms_result['success'],
+                'timestamp': now_iso
+            })
         
         return contact_results
         
     except Exception as e:
-        logger.error(f"Error notifying emergency contacts: {str(e)}")
+        logger.error("Error notifying emergency contacts: %s", e)
         return []
 
 def alert_healthcare_providers(alert_record: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Alert healthcare providers"""
     
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     try:
         # In production, this would query healthcare provider database
         # For hackathon, we simulate provider notifications
@@ -740,32 +928,33 @@ def alert_healthcare_providers(alert_record: Dict[str, Any]) -> List[Dict[str, A
         ]
         
         provider_results = []
-        notification_service = NotificationService()
         
-        for provider in providers:
-            message = f"PATIENT EMERGENCY: {alert_record['urgency_level']} alert for patient {alert_record['patient_id']}. Alert ID: {alert_record['alert_id']}"
-            
-            sms_result = notification_service.send_sms(
-                provider['phone'],
-                message
-            )
-            
+        # Same text for every provider, so it goes out as one batched send
+        message = f"PATIENT EMERGENCY: {alert_record['urgency_level']} alert for patient {alert_record['patient_id']}. Alert ID: {alert_record['alert_id']}"
+        sms_results = NOTIFICATION_SERVICE.send_sms_batch(
+            [provider['phone'] for provider in providers],
+            message
+        )
+        
+        for provider, sms_result in zip(providers, sms_results):
             provider_results.append({
                 'provider_name': provider['name'],
                 'specialty': provider['specialty'],
                 'notification_sent': sms_result['success'],
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             })
         
         return provider_results
         
     except Exception as e:
-        logger.error(f"Error alerting healthcare providers: {str(e)}")
+        logger.error("Error alerting healthcare providers: %s", e)
         return []
 
-def increase_device_monitoring(alert_record: Dict[str, Any]) -> Dict[str, Any]:
+def increase_device_monitoring(alert_record: Dict[str, Any], events_to_emit: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Increase device monitoring frequency during emergency"""
     
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     try:
         # Send event to increase monitoring frequency
         event_detail = {
@@ -774,37 +963,30 @@ def increase_device_monitoring(alert_record: Dict[str, Any]) -> Dict[str, Any]:
             'monitoring_mode': 'emergency',
             'frequency_multiplier': 3,  # 3x normal frequency
             'duration_minutes': 60,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
         
-        eventbridge.put_events(
-            Entries=[
-                {
-                    'Source': 'healthconnect.emergency',
-                    'DetailType': 'Increase Device Monitoring',
-                    'Detail': json.dumps(event_detail),
-                    'EventBusName': EVENT_BUS_NAME
-                }
-            ]
+        events_to_emit.append(
+            build_emergency_event(MONITORING_EVENT, event_detail)
         )
         
         return {
             'monitoring_increased': True,
             'frequency_multiplier': 3,
             'duration_minutes': 60,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
         
     except Exception as e:
-        logger.error(f"Error increasing device monitoring: {str(e)}")
+        logger.error("Error increasing device monitoring: %s", e)
         return {
             'monitoring_increased': False,
             'error': str(e),
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
 
-def send_emergency_response_event(alert_record: Dict[str, Any]) -> None:
-    """Send emergency response completion event"""
+def send_emergency_response_event(alert_record: Dict[str, Any], events_to_emit: List[Dict[str, Any]]) -> None:
+    """Queue emergency response completion event"""
     
     try:
         event_detail = {
@@ -817,23 +999,56 @@ def send_emergency_response_event(alert_record: Dict[str, Any]) -> None:
             'timestamp': datetime.now(timezone.utc).isoformat()
         }
         
-        eventbridge.put_events(
-            Entries=[
-                {
-                    'Source': 'healthconnect.emergency',
-                    'DetailType': 'Emergency Response Complete',
-                    'Detail': json.dumps(event_detail),
-                    'EventBusName': EVENT_BUS_NAME
-                }
-            ]
+        events_to_emit.append(
+            build_emergency_event(RESPONSE_COMPLETE_EVENT, event_detail)
         )
         
     except Exception as e:
-        logger.error(f"Error sending emergency response event: {str(e)}")
+        logger.error("Error sending emergency response event: %s", e)
+
+def build_emergency_event(template: Dict[str, str], detail: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an EventBridge entry from a prebuilt template"""
+    return {**template, 'Detail': _dumps(detail)}
 
-def schedule_follow_up_actions(alert_record: Dict[str, Any], response_protocol: Dict[str, Any]) -> None:
+def emit_emergency_events(events_to_emit: List[Dict[str, Any]]) -> int:
+    """Publish queued EventBridge entries in batches of 10; returns failed entry count"""
+    
+    failed_count = 0
+    
+    for start in range(0, len(events_to_emit), EVENT_BATCH_SIZE):
+        batch = events_to_emit[start:start + EVENT_BATCH_SIZE]
+        
+        # PutEvents can partially fail; resend only the entries that errored
+        for _ in range(EVENT_PUT_ATTEMPTS):
+            try:
+                response = eventbridge.put_events(Entries=batch)
+            except Exception as e:
+                logger.error("Error emitting emergency events: %s", e)
+                break
+            
+            batch = [
+                entry for entry, result in zip(batch, response['Entries'])
+                if 'ErrorCode' in result
+            ]
+            if not batch:
+                break
+        
+        failed_count += len(batch)
+    
+    if failed_count:
+        logger.error("Failed to emit %s of %s emergency events", failed_count, len(events_to_emit))
+    
+    return failed_count
+
+def schedule_follow_up_actions(alert_record: Dict[str, Any], response_protocol: Protocol) -> None:
     """Schedule follow-up actions for emergency alert"""
     
+    # Stacks without the follow-up scheduler (FOLLOW_UP_FUNCTION_ARN and
+    # FOLLOW_UP_SCHEDULER_ROLE_ARN unset) skip the status check
+    if not (FOLLOW_UP_FUNCTION_ARN and FOLLOW_UP_SCHEDULER_ROLE_ARN):
+        logger.warning("Follow-up scheduler not configured, skipping follow-up for %s", alert_record['alert_id'])
+        return
+    
     try:
         # Schedule 5-minute follow-up
         follow_up_time = datetime.now(timezone.utc) + timedelta(minutes=5)
@@ -845,28 +1060,86 @@ def schedule_follow_up_actions(alert_record: Dict[str, Any], response_protocol:
             'scheduled_time': follow_up_time.isoformat()
         }
         
-        # In production, this would use EventBridge scheduled rules
-        # For hackathon, we log the scheduled action
-        logger.info(f"Follow-up scheduled for {follow_up_time}: {json.dumps(follow_up_event)}")
+        # One-time EventBridge Scheduler schedule that invokes
+        # escalation_handler at the follow-up time and deletes itself
+        scheduler.create_schedule(
+            Name=f"followup-{alert_record['alert_id']}",
+            GroupName=FOLLOW_UP_SCHEDULE_GROUP,
+            ScheduleExpression=f"at({follow_up_time.strftime('%Y-%m-%dT%H:%M:%S')})",
+            ScheduleExpressionTimezone='UTC',
+            FlexibleTimeWindow={'Mode': 'OFF'},
+            ActionAfterCompletion='DELETE',
+            Target={
+                'Arn': FOLLOW_UP_FUNCTION_ARN,
+                'RoleArn': FOLLOW_UP_SCHEDULER_ROLE_ARN,
+                'Input': _dumps(follow_up_event)
+            }
+        )
+        
+        logger.info("Follow-up scheduled for %s: %s", follow_up_time, _dumps(follow_up_event))
         
     except Exception as e:
-        logger.error(f"Error scheduling follow-up actions: {str(e)}")
+        logger.error("Error scheduling follow-up actions: %s", e)
+
+def escalation_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
+    """
+    Run a scheduled follow-up status check on an emergency alert
+    
+    Invoked by the one-time schedule created in schedule_follow_up_actions;
+    an alert that is still ACTIVE has not been acknowledged, so its
+    emergency contacts and healthcare providers are notified again.
+    """
+    alert_id = event['alert_id']
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
+    alert_record = EMERGENCY_ALERTS.get_item(Key={'alert_id': alert_id}, ConsistentRead=True).get('Item')
+    if not alert_record:
+        logger.warning("Follow-up for unknown alert %s", alert_id)
+        return {'alert_id': alert_id, 'escalated': False}
+    
+    if alert_record.get('status') != 'ACTIVE':
+        logger.info("Alert %s is %s; no escalation needed", alert_id, alert_record.get('status'))
+        return {'alert_id': alert_id, 'escalated': False}
+    
+    contact_results = notify_emergency_contacts(alert_record, get_emergency_contacts(alert_record['patient_id']))
+    provider_results = alert_healthcare_providers(alert_record)
+    
+    # Only escalate alerts nobody acknowledged while the notifications went out
+    try:
+        EMERGENCY_ALERTS_CACHED.update_item(
+            Key={'alert_id': alert_id},
+            UpdateExpression='SET escalated_at = :escalated_at, updated_at = :escalated_at',
+            ConditionExpression='#status = :active',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={
+                ':escalated_at': now_iso,
+                ':active': 'ACTIVE'
+            }
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+    
+    logger.warning("Escalated unacknowledged alert %s: %s contacts, %s providers notified",
+                   alert_id, len(contact_results), len(provider_results))
+    
+    return {
+        'alert_id': alert_id,
+        'escalated': True,
+        'contacts_notified': contact_results,
+        'providers_alerted': provider_results,
+        'timestamp': now_iso
+    }
 
 def handle_manual_emergency(body: Dict[str, Any]) -> Dict[str, Any]:
     """Handle manually triggered emergency"""
     
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     try:
-        required_fields = ['patient_id', 'emergency_type']
-        for field in required_fields:
-            if field not in body:
-                return {
-                    'statusCode': 400,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Origin': '*'
-                    },
-                    'body': json.dumps({'error': f'Missing required field: {field}'})
-                }
+        missing = MANUAL_EMERGENCY_REQUIRED - body.keys()
+        if missing:
+            return _resp(400, {'error': f"Missing required fields: {', '.join(sorted(missing))}"})
         
         emergency_data = {
             'patient_id': body['patient_id'],
@@ -876,148 +1149,206 @@ def handle_manual_emergency(body: Dict[str, Any]) -> Dict[str, Any]:
             'source': 'manual',
             'description': body.get('description', ''),
             'location': body.get('location', ''),
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
         
         alert_response = process_emergency_alert(emergency_data)
         
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'alert_processed': alert_response['success'],
-                'alert_id': alert_response.get('alert_id'),
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        }
+        return _resp(200, {
+            'alert_processed': alert_response['success'],
+            'alert_id': alert_response.get('alert_id'),
+            'timestamp': now_iso
+        })
         
     except Exception as e:
-        logger.error(f"Error handling manual emergency: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': 'Failed to process manual emergency'})
-        }
+        logger.error("Error handling manual emergency: %s", e)
+        return _resp(500, {'error': 'Failed to process manual emergency'})
 
 def get_emergency_alerts(query_params: Dict[str, Any]) -> Dict[str, Any]:
     """Get emergency alerts with filtering"""
     
+    now = datetime.now(timezone.utc)
+    
     try:
-        table = dynamodb.Table(EMERGENCY_ALERTS_TABLE)
-        
-        # Build query based on parameters
-        if 'patient_id' in query_params:
-            # Query by patient ID
-            response = table.query(
-                IndexName='PatientIndex',  # Assuming GSI exists
-                KeyConditionExpression='patient_id = :patient_id',
-                ExpressionAttributeValues={':patient_id': query_params['patient_id']},
-                ScanIndexForward=False,  # Most recent first
-                Limit=int(query_params.get('limit', 50))
-            )
+        limit = _limit(query_params)
+        
+        try:
+            start_key = _decode_token(query_params['next_token']) if query_params.get('next_token') else None
+        except ValueError:
+            return _resp(400, {'error': 'Invalid next_token'})
+        
+        # Pick the most selective GSI for the supplied parameters; each is
+        # sorted by created_at so results come back most recent first
+        for index_name, key_name in ALERT_INDEXES:
+            if key_name in query_params:
+                # Only the dimensions the key condition did not cover need
+                # filtering; DynamoDB applies the filter server-side
+                filter_expression = None
+                for name in ('status', 'urgency_level'):
+                    if name in query_params and name != key_name:
+                        condition = Attr(name).eq(query_params[name])
+                        filter_expression = condition if filter_expression is None else filter_expression & condition
+                
+                alerts, last_key = query_alerts(
+                    index_name, key_name, query_params[key_name], limit, filter_expression, start_key
+                )
+                break
         else:
-            # Scan all alerts
-            response = table.scan(
-                Limit=int(query_params.get('limit', 50))
+            # No indexed parameter: query the recent weekly buckets in
+            # parallel, resuming from the bucket a cursor points into
+            buckets = [
+                (now - timedelta(weeks=weeks)).strftime(ALERT_BUCKET_FORMAT)
+                for weeks in range(ALERT_BUCKET_WEEKS)
+            ]
+            if start_key:
+                bucket = start_key.get('bucket')
+                buckets = buckets[buckets.index(bucket):] if bucket in buckets else []
+            
+            pages = EXECUTOR.map(
+                lambda bucket: query_alerts(
+                    'BucketIndex', 'bucket', bucket, limit,
+                    start_key=start_key if start_key and start_key['bucket'] == bucket else None
+                ),
+                buckets
             )
-        
-        alerts = response.get('Items', [])
-        
-        # Filter by status if specified
-        if 'status' in query_params:
-            alerts = [alert for alert in alerts if alert.get('status') == query_params['status']]
-        
-        # Filter by urgency level if specified
-        if 'urgency_level' in query_params:
-            alerts = [alert for alert in alerts if alert.get('urgency_level') == query_params['urgency_level']]
-        
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'alerts': alerts,
-                'count': len(alerts),
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        }
+            
+            # Buckets are disjoint and listed newest first, so concatenating
+            # their newest-first pages keeps created_at order. A page cut
+            # short by the read cap ends the listing; older buckets wait for
+            # the next call.
+            alerts = []
+            last_key = None
+            for bucket, (page, page_key) in zip(buckets, pages):
+                alerts.extend(page[:limit - len(alerts)])
+                if len(alerts) >= limit:
+                    last_key = {
+                        'alert_id': alerts[-1]['alert_id'],
+                        'bucket': bucket,
+                        'created_at': alerts[-1]['created_at']
+                    }
+                    break
+                if page_key:
+                    last_key = page_key
+                    break
+        
+        return _resp(200, {
+            'alerts': alerts,
+            'count': len(alerts),
+            'next_token': _encode_token(last_key) if last_key else None,
+            'timestamp': now.isoformat()
+        })
         
     except Exception as e:
-        logger.error(f"Error getting emergency alerts: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': 'Failed to retrieve alerts'})
+        logger.error("Error getting emergency alerts: %s", e)
+        return _resp(500, {'error': 'Failed to retrieve alerts'})
+
+def query_alerts(
+    index_name: str,
+    key_name: str,
+    key_value: str,
+    limit: int,
+    filter_expression: Optional[Any] = None,
+    start_key: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Query one alert index partition for listing rows, most recent first
+    
+    Returns at most limit rows and the key to resume after the last one,
+    or None once the partition is exhausted. Stops early, with a resume
+    key, after ALERT_QUERY_RCU_CAP read units.
+    """
+    
+    # boto3 merges its generated placeholders into ExpressionAttributeNames
+    # in place, so each request needs its own dict
+    request = {
+        'IndexName': index_name,
+        'KeyConditionExpression': Key(key_name).eq(key_value),
+        'ScanIndexForward': False,
+        'ProjectionExpression': ALERT_LIST_PROJECTION,
+        'ExpressionAttributeNames': {'#s': 'status'},
+        'ReturnConsumedCapacity': 'TOTAL'
+    }
+    if filter_expression is not None:
+        request['FilterExpression'] = filter_expression
+    if start_key:
+        request['ExclusiveStartKey'] = start_key
+    
+    # DynamoDB applies Limit before filtering, so keep paging until enough
+    # matches are collected. Unfiltered pages match every item read and
+    # ask for exactly what is still missing; filtered pages size adaptively
+    page_size = QUERY_PAGE_MIN
+    consumed = 0.0
+    alerts = []
+    while True:
+        request['Limit'] = page_size if filter_expression is not None else limit - len(alerts)
+        response = EMERGENCY_ALERTS_CACHED.query(**request)
+        items = response.get('Items', [])
+        alerts.extend(items)
+        last_key = response.get('LastEvaluatedKey')
+        consumed += float(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+        if len(alerts) >= limit or not last_key or consumed >= ALERT_QUERY_RCU_CAP:
+            break
+        request['ExclusiveStartKey'] = last_key
+        page_size = QUERY_PAGE_MIN if items else min(page_size * 2, QUERY_PAGE_MAX)
+    
+    # A filtered page can overshoot the limit; resume after the last row
+    # actually returned rather than the last row read
+    if len(alerts) > limit:
+        alerts = alerts[:limit]
+        last_key = {
+            'alert_id': alerts[-1]['alert_id'],
+            key_name: key_value,
+            'created_at': alerts[-1]['created_at']
         }
+    
+    return alerts, last_key
 
 def update_alert_status(body: Dict[str, Any]) -> Dict[str, Any]:
     """Update emergency alert status"""
     
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     try:
         alert_id = body.get('alert_id')
         new_status = body.get('status')
         
         if not alert_id or not new_status:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
+            return _resp(400, {'error': 'alert_id and status are required'})
+        
+        # The condition rejects unknown alert ids instead of upserting a
+        # stub item, and only the changed attributes are returned
+        try:
+            response = EMERGENCY_ALERTS_CACHED.update_item(
+                Key={'alert_id': alert_id},
+                UpdateExpression='SET #status = :status, updated_at = :updated_at',
+                ConditionExpression='attribute_exists(alert_id)',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={
+                    ':status': new_status,
+                    ':updated_at': now_iso
                 },
-                'body': json.dumps({'error': 'alert_id and status are required'})
-            }
-        
-        table = dynamodb.Table(EMERGENCY_ALERTS_TABLE)
-        
-        response = table.update_item(
-            Key={'alert_id': alert_id},
-            UpdateExpression='SET #status = :status, updated_at = :updated_at',
-            ExpressionAttributeNames={'#status': 'status'},
-            ExpressionAttributeValues={
-                ':status': new_status,
-                ':updated_at': datetime.now(timezone.utc).isoformat()
-            },
-            ReturnValues='ALL_NEW'
-        )
-        
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'updated': True,
-                'alert': response['Attributes'],
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        }
+                ReturnValues='UPDATED_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return _resp(404, {'error': 'Alert not found'})
+        
+        return _resp(200, {
+            'updated': True,
+            'alert': {'alert_id': alert_id, **response['Attributes']},
+            'timestamp': now_iso
+        })
         
     except Exception as e:
-        logger.error(f"Error updating alert status: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': 'Failed to update alert status'})
-        }
+        logger.error("Error updating alert status: %s", e)
+        return _resp(500, {'error': 'Failed to update alert status'})
 
 def test_emergency_system() -> Dict[str, Any]:
     """Test emergency system functionality"""
     
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     try:
         test_alert = {
             'patient_id': 'test_patient_123',
@@ -1029,38 +1360,24 @@ def test_emergency_system() -> Dict[str, Any]:
                 'blood_pressure': {'systolic': 140, 'diastolic': 90},
                 'temperature': 37.2
             },
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso
         }
         
         # Process test alert
         alert_response = process_emergency_alert(test_alert)
         
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'test_completed': True,
-                'alert_processed': alert_response['success'],
-                'alert_id': alert_response.get('alert_id'),
-                'system_status': 'operational',
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        }
+        return _resp(200, {
+            'test_completed': True,
+            'alert_processed': alert_response['success'],
+            'alert_id': alert_response.get('alert_id'),
+            'system_status': 'operational',
+            'timestamp': now_iso
+        })
         
     except Exception as e:
-        logger.error(f"Error testing emergency system: {str(e)}")
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'test_completed': False,
-                'error': str(e),
-                'system_status': 'error'
-            })
-        }
+        logger.error("Error testing emergency system: %s", e)
+        return _resp(500, {
+            'test_completed': False,
+            'error': str(e),
+            'system_status': 'error'
+        })
@@ -2,91 +2,156 @@ import logging
 import os
 from typing import Dict, Any, List, Optional
 import boto3
-from botocore.exceptions import ClientError
-import json
+from botocore.config import Config
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
 from datetime import datetime, timezone
+from html import escape
+from xml.sax.saxutils import escape as xml_escape
 import phonenumbers
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+import re
 import requests
+import socket
+import base64
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from string import Template
+from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
+from twilio.base.exceptions import TwilioRestException
+
+try:
+    from email_validator import validate_email, EmailNotValidError
+except ImportError:
+    validate_email = None
 
 logger = logging.getLogger(__name__)
 
-class NotificationService:
-    """Production-grade notification service for emergency alerts"""[2]
+# Module-level clients survive across warm Lambda invocations, so endpoint
+# and credential resolution and the keep-alive connection pools are paid
+# once per container rather than once per NotificationService
+AWS_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'max_attempts': 5, 'mode': 'adaptive'}
+)
+sns = boto3.client('sns', config=AWS_CONFIG)
+ses = boto3.client('ses', config=AWS_CONFIG)
+pinpoint = boto3.client('pinpoint', config=AWS_CONFIG)
+
+# Provider failures a send reports as an unsuccessful result; botocore's
+# adaptive retries have already absorbed throttling and transient 5xx
+# errors by the time one of these reaches application code
+AWS_SEND_ERRORS = (ClientError, EndpointConnectionError, ReadTimeoutError)
+TWILIO_SMS_ERRORS = (requests.RequestException, ValueError, KeyError)
+TWILIO_VOICE_ERRORS = (TwilioRestException, requests.RequestException)
+
+# Each channel send blocks on a provider round-trip; multi-channel fan-out
+# runs them concurrently so the slowest channel sets the latency
+CHANNEL_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Basic address check; the full email_validator check only runs for
+# addresses this rejects
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# SES passthrough templates for bulk sends (deployed with the stack): each
+# recipient gets exactly the subject/body send_email would have sent, in one
+# SendBulkTemplatedEmail call per SES_BULK_DESTINATIONS recipients
+SES_TEMPLATE_TEXT = os.environ.get('SES_TEMPLATE_TEXT', 'HealthConnectEmergencyAlertTextV1')
+SES_TEMPLATE_HTML = os.environ.get('SES_TEMPLATE_HTML', 'HealthConnectEmergencyAlertV1')
+SES_BULK_DESTINATIONS = 50
+
+# SNS PublishBatch accepts at most 10 entries per call
+SNS_PUBLISH_BATCH_SIZE = 10
+
+# Probe idle pooled sockets so a connection opened for one emergency is
+# still usable for the next; the idle/interval knobs are Linux-only
+TCP_KEEPALIVE_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, 'TCP_KEEPIDLE'):
+    TCP_KEEPALIVE_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15)
+    ]
+
+# SMS goes straight to the Twilio REST API over the pooled keep-alive
+# session; the SDK client is only used for voice calls
+TWILIO_API_URL = 'https://api.twilio.com'
+TWILIO_SMS_TIMEOUT = 5
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections enable TCP keep-alive"""
     
-    def __init__(self):
-        # Initialize AWS clients
-        self.sns = boto3.client('sns')
-        self.ses = boto3.client('ses')
-        self.pinpoint = boto3.client('pinpoint')
-        
-        # Environment variables
-        self.twilio_account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
-        self.twilio_auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
-        self.twilio_phone_number = os.environ.get('TWILIO_PHONE_NUMBER', '+1234567890')
-        self.ses_sender_email = os.environ.get('SES_SENDER_EMAIL', 'alerts@healthconnect.ai')
-        self.pinpoint_app_id = os.environ.get('PINPOINT_APP_ID')
-        
-        # Notification templates
-        self.templates = {
-            'emergency_sms': {
-                'critical': "🚨 CRITICAL EMERGENCY: {patient_id} - {emergency_type}. Location: {location}. Call 911 immediately. Alert ID: {alert_id}",
-                'high': "⚠️ HIGH PRIORITY: Health emergency for {patient_id} - {emergency_type}. Please respond immediately. Alert ID: {alert_id}",
-                'medium': "⚠️ HEALTH ALERT: {patient_id} - {emergency_type}. Please check on patient. Alert ID: {alert_id}",
-                'low': "ℹ️ Health notification for {patient_id}. Alert ID: {alert_id}"
-            },
-            'emergency_email': {
-                'subject': "🚨 {urgency_level} Health Emergency Alert - Patient {patient_id}",
-                'body_template': """
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + TCP_KEEPALIVE_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+# Notification templates, built once per container and shared by every
+# NotificationService instance
+NOTIFICATION_TEMPLATES = {
+    'emergency_sms': {
+        'critical': "🚨 CRITICAL EMERGENCY: {patient_id} - {emergency_type}. Location: {location}. Call 911 immediately. Alert ID: {alert_id}",
+        'high': "⚠️ HIGH PRIORITY: Health emergency for {patient_id} - {emergency_type}. Please respond immediately. Alert ID: {alert_id}",
+        'medium': "⚠️ HEALTH ALERT: {patient_id} - {emergency_type}. Please check on patient. Alert ID: {alert_id}",
+        'low': "ℹ️ Health notification for {patient_id}. Alert ID: {alert_id}"
+    },
+    'emergency_email': {
+        'subject': "🚨 {urgency_level} Health Emergency Alert - Patient {patient_id}",
+        # Static markup and CSS; only body_template goes through format
+        'body_head': """
 <!DOCTYPE html>
 <html>
 <head>
     <style>
-        .emergency-alert {{
+        .emergency-alert {
             font-family: Arial, sans-serif;
             max-width: 600px;
             margin: 0 auto;
             border: 3px solid #dc3545;
             border-radius: 8px;
             padding: 20px;
-        }}
-        .header {{
+        }
+        .header {
             background-color: #dc3545;
             color: white;
             padding: 15px;
             text-align: center;
             margin: -20px -20px 20px -20px;
             border-radius: 5px 5px 0 0;
-        }}
-        .critical {{ background-color: #dc3545; }}
-        .high {{ background-color: #fd7e14; }}
-        .medium {{ background-color: #ffc107; color: black; }}
-        .low {{ background-color: #28a745; }}
-        .vital-signs {{
+        }
+        .critical { background-color: #dc3545; }
+        .high { background-color: #fd7e14; }
+        .medium { background-color: #ffc107; color: black; }
+        .low { background-color: #28a745; }
+        .vital-signs {
             background-color: #f8f9fa;
             padding: 15px;
             border-radius: 5px;
             margin: 15px 0;
-        }}
-        .actions {{
+        }
+        .actions {
             background-color: #e9ecef;
             padding: 15px;
             border-radius: 5px;
             margin: 15px 0;
-        }}
-        .footer {{
+        }
+        .footer {
             font-size: 12px;
             color: #6c757d;
             text-align: center;
             margin-top: 20px;
             padding-top: 20px;
             border-top: 1px solid #dee2e6;
-        }}
+        }
     </style>
 </head>
 <body>
-    <div class="emergency-alert">
+""",
+        'body_template': """    <div class="emergency-alert">
         <div class="header {urgency_class}">
             <h1>🚨 {urgency_level} HEALTH EMERGENCY</h1>
             <h2>Patient: {patient_id}</h2>
@@ -124,12 +189,149 @@ class NotificationService:
 </body>
 </html>
 """
+    }
+}
+
+# TwiML for critical voice calls; the message is XML-escaped before it is
+# substituted in
+VOICE_TWIML_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?><Response>'
+    '<Say language="en-US" voice="alice">This is a critical health emergency alert from HealthConnect AI. '
+    '{message}. Please respond immediately. This message will repeat.</Say>'
+    '<Pause length="2" />'
+    '<Say language="en-US" voice="alice">Repeating: {message}. Please take immediate action.</Say>'
+    '</Response>'
+)
+
+# Template/CSS keys for the standard urgency levels; anything else falls
+# back to lower-casing the level
+URGENCY_KEY = {
+    'CRITICAL': 'critical',
+    'HIGH': 'high',
+    'MEDIUM': 'medium',
+    'LOW': 'low'
+}
+
+# SMS templates precompiled to string.Template, keyed by upper-case level
+SMS_TEMPLATES = {
+    level.upper(): Template(re.sub(r'\{(\w+)\}', r'${\1}', template))
+    for level, template in NOTIFICATION_TEMPLATES['emergency_sms'].items()
+}
+
+# Recommended actions are the same for every alert, so their HTML list is
+# rendered once at import
+EMAIL_ACTIONS = (
+    "Contact emergency services if needed",
+    "Monitor patient continuously",
+    "Document all observations",
+    "Stay with patient until help arrives"
+)
+EMAIL_ACTIONS_HTML = '<ul>' + ''.join(f"<li>{action}</li>" for action in EMAIL_ACTIONS) + '</ul>'
+
+@lru_cache(maxsize=4096)
+def format_phone_number(phone_number: str, region: str = "US") -> Optional[str]:
+    """Parse and validate a phone number, returning it in E.164 form"""
+    
+    # The same contact numbers recur across channels and alerts, and the
+    # result only depends on the input, so parses are cached per container
+    try:
+        parsed = phonenumbers.parse(phone_number, region)
+        
+        if phonenumbers.is_valid_number(parsed):
+            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        else:
+            return None
+            
+    except phonenumbers.NumberParseException:
+        return None
+
+class NotificationService:
+    """Production-grade notification service for emergency alerts"""[2]
+    
+    # Fixed attribute set: no per-instance __dict__, and attribute reads on
+    # the send path are slot loads
+    __slots__ = (
+        'sns', 'ses', 'pinpoint',
+        'twilio_account_sid', 'twilio_auth_token', 'twilio_phone_number',
+        'ses_sender_email', 'pinpoint_app_id', '_push_topic_arn', '_sms_topic_arn',
+        '_twilio_enabled', '_pinpoint_enabled', '_enabled_channels',
+        '_http', '_twilio', '_twilio_headers', '_twilio_sms_url',
+        'templates', '_sms_templates', '_email_subject_tmpl', '_email_body_head', '_email_body_tmpl'
+    )
+    
+    def __init__(self):
+        # Shared module-level AWS clients
+        self.sns = sns
+        self.ses = ses
+        self.pinpoint = pinpoint
+        
+        # Environment variables
+        self.twilio_account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
+        self.twilio_auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
+        self.twilio_phone_number = os.environ.get('TWILIO_PHONE_NUMBER', '+1234567890')
+        self.ses_sender_email = os.environ.get('SES_SENDER_EMAIL', 'alerts@healthconnect.ai')
+        self.pinpoint_app_id = os.environ.get('PINPOINT_APP_ID')
+        # The SMS topic only delivers to numbers that were subscribed to it
+        # with a phone_number filter policy, so batch SMS uses it only when
+        # that fan-out has been explicitly enabled
+        self._sms_topic_arn = None
+        if os.environ.get('SMS_TOPIC_FANOUT_ENABLED', 'false').lower() == 'true':
+            self._sms_topic_arn = os.environ.get('EMERGENCY_SMS_TOPIC_ARN')
+        # Same for push: the topic only reaches device endpoints subscribed
+        # with a patient_id filter policy, so Pinpoint stays the default
+        self._push_topic_arn = None
+        if os.environ.get('PUSH_TOPIC_FANOUT_ENABLED', 'false').lower() == 'true':
+            self._push_topic_arn = os.environ.get('EMERGENCY_PUSH_TOPIC_ARN')
+        
+        # Channels this instance can actually deliver on; SMS falls back to
+        # SNS and email always goes through SES, so only voice and push
+        # depend on configuration
+        self._twilio_enabled = bool(self.twilio_account_sid and self.twilio_auth_token)
+        self._pinpoint_enabled = bool(self.pinpoint_app_id)
+        self._enabled_channels = {'sms', 'email'}
+        if self._twilio_enabled:
+            self._enabled_channels.add('voice')
+        if self._pinpoint_enabled or self._push_topic_arn:
+            self._enabled_channels.add('push')
+        
+        # One Twilio client over a pooled keep-alive session, so only the
+        # first SMS or voice call pays the TLS handshake. Retries cover
+        # connection failures and idempotent requests only, so a message
+        # POST is never sent twice.
+        self._http = None
+        self._twilio = None
+        if self._twilio_enabled:
+            twilio_http = TwilioHttpClient(timeout=10)
+            twilio_http.session.mount('https://', KeepAliveAdapter(
+                pool_connections=16,
+                pool_maxsize=64,
+                max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504])
+            ))
+            self._http = twilio_http.session
+            self._twilio = Client(self.twilio_account_sid, self.twilio_auth_token, http_client=twilio_http)
+            
+            # SMS posts share the session's connection pool, so concurrent
+            # sends each get their own pooled connection
+            credentials = f"{self.twilio_account_sid}:{self.twilio_auth_token}".encode()
+            self._twilio_headers = {
+                'Authorization': f"Basic {base64.b64encode(credentials).decode()}",
+                'Accept': 'application/json'
             }
-        }
+            self._twilio_sms_url = f"{TWILIO_API_URL}/2010-04-01/Accounts/{self.twilio_account_sid}/Messages.json"
+        
+        # Notification templates
+        self.templates = NOTIFICATION_TEMPLATES
+        # Bound once so the formatters skip the nested template lookups
+        self._sms_templates = SMS_TEMPLATES
+        self._email_subject_tmpl = self.templates['emergency_email']['subject']
+        self._email_body_head = self.templates['emergency_email']['body_head']
+        self._email_body_tmpl = self.templates['emergency_email']['body_template']
     
-    def send_sms(self, phone_number: str, message: str, urgency_level: str = 'HIGH') -> Dict[str, Any]:
+    def send_sms(self, phone_number: str, message: str, urgency_level: str = 'HIGH', timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Send SMS notification using multiple providers for reliability"""[2]
         
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        
         try:
             # Validate and format phone number
             formatted_phone = self._format_phone_number(phone_number)
@@ -137,68 +339,87 @@ class NotificationService:
                 return {
                     'success': False,
                     'error': 'Invalid phone number format',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
+                    'timestamp': now_iso
                 }
             
             # Try Twilio first (most reliable for emergency notifications)
-            if self.twilio_account_sid and self.twilio_auth_token:
-                twilio_result = self._send_sms_twilio(formatted_phone, message, urgency_level)
+            if self._twilio:
+                twilio_result = self._send_sms_twilio(formatted_phone, message, urgency_level, now_iso)
                 if twilio_result['success']:
                     return twilio_result
                 else:
-                    logger.warning(f"Twilio SMS failed, trying AWS SNS: {twilio_result.get('error')}")
+                    logger.warning("Twilio SMS failed, trying AWS SNS: %s", twilio_result.get('error'))
             
             # Fallback to AWS SNS
-            sns_result = self._send_sms_sns(formatted_phone, message, urgency_level)
+            sns_result = self._send_sms_sns(formatted_phone, message, urgency_level, now_iso)
             return sns_result
             
         except Exception as e:
-            logger.error(f"Error sending SMS: {str(e)}")
+            logger.error("Error sending SMS: %s", e)
             return {
                 'success': False,
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
     
-    def _send_sms_twilio(self, phone_number: str, message: str, urgency_level: str) -> Dict[str, Any]:
+    def _send_sms_twilio(self, phone_number: str, message: str, urgency_level: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Send SMS using Twilio API"""
         
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        
         try:
-            from twilio.rest import Client
-            
-            client = Client(self.twilio_account_sid, self.twilio_auth_token)
-            
             # Add urgency indicator to message
             priority_message = f"[{urgency_level}] {message}"
             
-            message_obj = client.messages.create(
-                body=priority_message,
-                from_=self.twilio_phone_number,
-                to=phone_number
+            # A message POST is never retried: once the request may have
+            # reached Twilio, a resend could text the recipient twice
+            response = self._http.post(
+                self._twilio_sms_url,
+                data={
+                    'To': phone_number,
+                    'From': self.twilio_phone_number,
+                    'Body': priority_message
+                },
+                headers=self._twilio_headers,
+                timeout=TWILIO_SMS_TIMEOUT
             )
+            status = response.status_code
+            
+            message_obj = orjson.loads(response.content)
+            if status >= 400:
+                error = f"HTTP {status}: {message_obj.get('message', 'Twilio request failed')}"
+                logger.error("Twilio SMS error: %s", error)
+                return {
+                    'success': False,
+                    'provider': 'twilio',
+                    'error': error,
+                    'timestamp': now_iso
+                }
             
-            logger.info(f"Twilio SMS sent successfully: {message_obj.sid}")
+            logger.info("Twilio SMS sent successfully: %s", message_obj['sid'])
             
             return {
                 'success': True,
                 'provider': 'twilio',
-                'message_id': message_obj.sid,
-                'status': message_obj.status,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'message_id': message_obj['sid'],
+                'status': message_obj['status'],
+                'timestamp': now_iso
             }
             
-        except Exception as e:
-            logger.error(f"Twilio SMS error: {str(e)}")
+        except TWILIO_SMS_ERRORS as e:
+            logger.error("Twilio SMS error: %s", e)
             return {
                 'success': False,
                 'provider': 'twilio',
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
     
-    def _send_sms_sns(self, phone_number: str, message: str, urgency_level: str) -> Dict[str, Any]:
+    def _send_sms_sns(self, phone_number: str, message: str, urgency_level: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Send SMS using AWS SNS"""
         
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        
         try:
             # Add urgency indicator to message
             priority_message = f"[{urgency_level}] {message}"
@@ -218,41 +439,123 @@ class NotificationService:
                 }
             )
             
-            logger.info(f"AWS SNS SMS sent successfully: {response['MessageId']}")
+            logger.info("AWS SNS SMS sent successfully: %s", response['MessageId'])
             
             return {
                 'success': True,
                 'provider': 'aws_sns',
                 'message_id': response['MessageId'],
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
             
-        except ClientError as e:
-            logger.error(f"AWS SNS SMS error: {str(e)}")
+        except AWS_SEND_ERRORS as e:
+            logger.error("AWS SNS SMS error: %s", e)
             return {
                 'success': False,
                 'provider': 'aws_sns',
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
     
+    def send_sms_batch(
+        self,
+        phone_numbers: List[str],
+        message: str,
+        urgency_level: str = 'HIGH',
+        timestamp: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Send the same SMS to many recipients; returns one result per number"""
+        
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(phone_numbers)
+        
+        valid = []
+        for position, phone_number in enumerate(phone_numbers):
+            formatted_phone = self._format_phone_number(phone_number)
+            if formatted_phone:
+                valid.append((position, formatted_phone))
+            else:
+                results[position] = {
+                    'success': False,
+                    'error': 'Invalid phone number format',
+                    'timestamp': now_iso
+                }
+        
+        # By default every number goes through send_sms (Twilio, then a
+        # direct SNS publish); the topic is used only when fan-out is enabled
+        if not self._sms_topic_arn:
+            for position, formatted_phone in valid:
+                results[position] = self.send_sms(formatted_phone, message, urgency_level, now_iso)
+            return results
+        
+        # Each entry is published to the SMS topic; a recipient's SMS
+        # subscription carries a phone_number filter policy, so it only
+        # receives the entries addressed to it
+        priority_message = f"[{urgency_level}] {message}"
+        
+        for start in range(0, len(valid), SNS_PUBLISH_BATCH_SIZE):
+            chunk = valid[start:start + SNS_PUBLISH_BATCH_SIZE]
+            try:
+                response = self.sns.publish_batch(
+                    TopicArn=self._sms_topic_arn,
+                    PublishBatchRequestEntries=[
+                        {
+                            'Id': str(position),
+                            'Message': priority_message,
+                            'MessageAttributes': {
+                                'phone_number': {'DataType': 'String', 'StringValue': formatted_phone},
+                                'urgency_level': {'DataType': 'String', 'StringValue': urgency_level},
+                                'AWS.SNS.SMS.SenderID': {'DataType': 'String', 'StringValue': 'HealthConnect'},
+                                'AWS.SNS.SMS.SMSType': {'DataType': 'String', 'StringValue': 'Transactional'}
+                            }
+                        }
+                        for position, formatted_phone in chunk
+                    ]
+                )
+            except AWS_SEND_ERRORS as e:
+                logger.error("AWS SNS batch SMS error, sending individually: %s", e)
+                for position, formatted_phone in chunk:
+                    results[position] = self.send_sms(formatted_phone, message, urgency_level, now_iso)
+                continue
+            
+            for entry in response.get('Successful', []):
+                results[int(entry['Id'])] = {
+                    'success': True,
+                    'provider': 'aws_sns_topic',
+                    'message_id': entry['MessageId'],
+                    'timestamp': now_iso
+                }
+            
+            # Entries SNS rejected get the regular per-number path
+            for entry in response.get('Failed', []):
+                logger.warning("AWS SNS batch SMS entry failed, sending individually: %s", entry.get('Message', entry.get('Code')))
+                position = int(entry['Id'])
+                results[position] = self.send_sms(phone_numbers[position], message, urgency_level, now_iso)
+        
+        logger.info("Batch SMS sent: %s/%s successful", sum(1 for r in results if r['success']), len(results))
+        
+        return results
+    
     def send_email(
         self, 
         email_address: str, 
         subject: str, 
         body: str, 
         urgency_level: str = 'HIGH',
-        html_body: Optional[str] = None
+        html_body: Optional[str] = None,
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """Send email notification using AWS SES"""[2]
         
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        
         try:
             # Validate email address
             if not self._validate_email(email_address):
                 return {
                     'success': False,
                     'error': 'Invalid email address',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
+                    'timestamp': now_iso
                 }
             
             # Add urgency indicator to subject
@@ -291,45 +594,144 @@ class NotificationService:
                     ]
                 )
             
-            logger.info(f"Email sent successfully: {response['MessageId']}")
+            logger.info("Email sent successfully: %s", response['MessageId'])
             
             return {
                 'success': True,
                 'provider': 'aws_ses',
                 'message_id': response['MessageId'],
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
             
-        except ClientError as e:
-            logger.error(f"AWS SES email error: {str(e)}")
+        except AWS_SEND_ERRORS as e:
+            logger.error("AWS SES email error: %s", e)
             return {
                 'success': False,
                 'provider': 'aws_ses',
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
     
+    def send_email_bulk(
+        self,
+        email_addresses: List[str],
+        subject: str,
+        body: str,
+        urgency_level: str = 'HIGH',
+        html_body: Optional[str] = None,
+        timestamp: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Send the same email to many recipients; returns one result per address"""
+        
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(email_addresses)
+        
+        # Invalid addresses are reported without being sent
+        valid = []
+        for position, email_address in enumerate(email_addresses):
+            if self._validate_email(email_address):
+                valid.append(position)
+            else:
+                results[position] = {
+                    'success': False,
+                    'error': 'Invalid email address',
+                    'timestamp': now_iso
+                }
+        
+        template_data = {'subject': f"[{urgency_level}] {subject}", 'body': body}
+        if html_body:
+            template_data['html_body'] = html_body
+        
+        for start in range(0, len(valid), SES_BULK_DESTINATIONS):
+            chunk = valid[start:start + SES_BULK_DESTINATIONS]
+            try:
+                response = self.ses.send_bulk_templated_email(
+                    Source=self.ses_sender_email,
+                    Template=SES_TEMPLATE_HTML if html_body else SES_TEMPLATE_TEXT,
+                    DefaultTemplateData=orjson.dumps(template_data).decode(),
+                    Destinations=[
+                        {'Destination': {'ToAddresses': [email_addresses[position]]}}
+                        for position in chunk
+                    ],
+                    DefaultTags=[
+                        {'Name': 'Purpose', 'Value': 'EmergencyAlert'},
+                        {'Name': 'UrgencyLevel', 'Value': urgency_level}
+                    ]
+                )
+            except AWS_SEND_ERRORS as e:
+                # Templates missing or bulk sending unavailable: fall back to
+                # one SendEmail per recipient rather than dropping the alert
+                logger.error("AWS SES bulk email error, sending individually: %s", e)
+                for position in chunk:
+                    results[position] = self.send_email(
+                        email_addresses[position], subject, body, urgency_level, html_body, now_iso
+                    )
+                continue
+            
+            # Statuses come back in destination order
+            for position, status in zip(chunk, response['Status']):
+                if 'MessageId' in status:
+                    results[position] = {
+                        'success': True,
+                        'provider': 'aws_ses',
+                        'message_id': status['MessageId'],
+                        'timestamp': now_iso
+                    }
+                else:
+                    results[position] = {
+                        'success': False,
+                        'provider': 'aws_ses',
+                        'error': status.get('Error', status.get('Status')),
+                        'timestamp': now_iso
+                    }
+        
+        logger.info("Bulk email sent: %s/%s successful", sum(1 for r in results if r['success']), len(results))
+        
+        return results
+    
     def send_push_notification(
         self, 
         patient_id: str, 
         title: str, 
         message: str, 
-        urgency_level: str = 'HIGH'
+        urgency_level: str = 'HIGH',
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """Send push notification using AWS Pinpoint"""[2]
         
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        
+        # The SNS mobile-push topic is used only when fan-out is enabled
+        if self._push_topic_arn:
+            return self.send_push_broadcast(patient_id, title, message, urgency_level, now_iso)
+        
         try:
-            if not self.pinpoint_app_id:
+            if not self._pinpoint_enabled:
                 logger.warning("Pinpoint app ID not configured, skipping push notification")
                 return {
                     'success': False,
                     'error': 'Push notifications not configured',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
+                    'timestamp': now_iso
                 }
             
             # Add urgency indicator to title
             priority_title = f"[{urgency_level}] {title}"
             
+            # GCM and APNS carry the same message; botocore serializes each
+            # reference independently without mutating it, so one dict serves both
+            push_message = {
+                'Action': 'OPEN_APP',
+                'Body': message,
+                'Priority': 'high',
+                'SilentPush': False,
+                'Title': priority_title,
+                'Data': {
+                    'urgency_level': urgency_level,
+                    'alert_type': 'emergency',
+                    'timestamp': now_iso
+                }
+            }
+            
             # Send push notification
             response = self.pinpoint.send_messages(
                 ApplicationId=self.pinpoint_app_id,
@@ -340,121 +742,147 @@ class NotificationService:
                         }
                     },
                     'MessageConfiguration': {
-                        'GCMMessage': {
-                            'Action': 'OPEN_APP',
-                            'Body': message,
-                            'Priority': 'high',
-                            'SilentPush': False,
-                            'Title': priority_title,
-                            'Data': {
-                                'urgency_level': urgency_level,
-                                'alert_type': 'emergency',
-                                'timestamp': datetime.now(timezone.utc).isoformat()
-                            }
-                        },
-                        'APNSMessage': {  # iOS push notifications
-                            'Action': 'OPEN_APP',
-                            'Body': message,
-                            'Priority': 'high',
-                            'SilentPush': False,
-                            'Title': priority_title,
-                            'Data': {
-                                'urgency_level': urgency_level,
-                                'alert_type': 'emergency',
-                                'timestamp': datetime.now(timezone.utc).isoformat()
-                            }
-                        }
+                        'GCMMessage': push_message,
+                        'APNSMessage': push_message  # iOS push notifications
                     }
                 }
             )
             
-            logger.info(f"Push notification sent successfully: {response['MessageResponse']['RequestId']}")
+            logger.info("Push notification sent successfully: %s", response['MessageResponse']['RequestId'])
             
             return {
                 'success': True,
                 'provider': 'aws_pinpoint',
                 'request_id': response['MessageResponse']['RequestId'],
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
             
-        except ClientError as e:
-            logger.error(f"AWS Pinpoint push notification error: {str(e)}")
+        except AWS_SEND_ERRORS as e:
+            logger.error("AWS Pinpoint push notification error: %s", e)
             return {
                 'success': False,
                 'provider': 'aws_pinpoint',
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
+            }
+    
+    def send_push_broadcast(
+        self,
+        patient_id: str,
+        title: str,
+        message: str,
+        urgency_level: str = 'HIGH',
+        timestamp: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Send push notification with one publish to the SNS mobile-push topic"""
+        
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        
+        try:
+            priority_title = f"[{urgency_level}] {title}"
+            data = {
+                'urgency_level': urgency_level,
+                'alert_type': 'emergency',
+                'timestamp': now_iso
+            }
+            
+            # SNS fans the message out to every subscribed device endpoint;
+            # endpoints subscribe with a patient_id filter policy, so only the
+            # patient's own devices receive it
+            response = self.sns.publish(
+                TopicArn=self._push_topic_arn,
+                MessageStructure='json',
+                Message=orjson.dumps({
+                    'default': message,
+                    'GCM': orjson.dumps({
+                        'priority': 'high',
+                        'notification': {'title': priority_title, 'body': message},
+                        'data': data
+                    }).decode(),
+                    'APNS': orjson.dumps({
+                        'aps': {'alert': {'title': priority_title, 'body': message}, 'sound': 'default'},
+                        'data': data
+                    }).decode()
+                }).decode(),
+                MessageAttributes={
+                    'patient_id': {'DataType': 'String', 'StringValue': patient_id},
+                    'urgency_level': {'DataType': 'String', 'StringValue': urgency_level}
+                }
+            )
+            
+            logger.info("Push notification published successfully: %s", response['MessageId'])
+            
+            return {
+                'success': True,
+                'provider': 'aws_sns_push',
+                'message_id': response['MessageId'],
+                'timestamp': now_iso
+            }
+            
+        except AWS_SEND_ERRORS as e:
+            logger.error("AWS SNS push notification error: %s", e)
+            return {
+                'success': False,
+                'provider': 'aws_sns_push',
+                'error': str(e),
+                'timestamp': now_iso
             }
     
     def send_voice_call(
         self, 
         phone_number: str, 
         message: str, 
-        urgency_level: str = 'CRITICAL'
+        urgency_level: str = 'CRITICAL',
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """Send voice call notification for critical emergencies"""[2]
         
+        now_iso = timestamp or datetime.now(timezone.utc).isoformat()
+        
         try:
             # Only send voice calls for critical emergencies
             if urgency_level != 'CRITICAL':
                 return {
                     'success': False,
                     'error': 'Voice calls only sent for CRITICAL emergencies',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
+                    'timestamp': now_iso
                 }
             
-            if not self.twilio_account_sid:
+            if not self._twilio:
                 return {
                     'success': False,
                     'error': 'Voice call service not configured',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
+                    'timestamp': now_iso
                 }
             
-            from twilio.rest import Client
-            from twilio.twiml import VoiceResponse
-            
-            client = Client(self.twilio_account_sid, self.twilio_auth_token)
-            
             # Create TwiML for voice message
-            response_twiml = VoiceResponse()
-            response_twiml.say(
-                f"This is a critical health emergency alert from HealthConnect AI. {message}. "
-                f"Please respond immediately. This message will repeat.",
-                voice='alice',
-                language='en-US'
-            )
-            response_twiml.pause(length=2)
-            response_twiml.say(
-                f"Repeating: {message}. Please take immediate action.",
-                voice='alice',
-                language='en-US'
-            )
+            twiml_body = VOICE_TWIML_TEMPLATE.format(message=xml_escape(message))
             
             # Make the call
-            call = client.calls.create(
-                twiml=str(response_twiml),
+            call = self._twilio.calls.create(
+                twiml=twiml_body,
                 to=phone_number,
                 from_=self.twilio_phone_number,
                 timeout=30
             )
             
-            logger.info(f"Voice call initiated successfully: {call.sid}")
+            logger.info("Voice call initiated successfully: %s", call.sid)
             
             return {
                 'success': True,
                 'provider': 'twilio_voice',
                 'call_id': call.sid,
                 'status': call.status,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
             
-        except Exception as e:
-            logger.error(f"Voice call error: {str(e)}")
+        except TWILIO_VOICE_ERRORS as e:
+            logger.error("Voice call error: %s", e)
             return {
                 'success': False,
                 'provider': 'twilio_voice',
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
     
     def send_multi_channel_notification(
@@ -464,89 +892,77 @@ class NotificationService:
     ) -> Dict[str, Any]:
         """Send notification through multiple channels for maximum reliability"""[2]
         
+        # One timestamp for the whole fan-out, shared by every channel result
+        now_iso = datetime.now(timezone.utc).isoformat()
+        
         try:
             results = {
                 'channels_attempted': 0,
                 'channels_successful': 0,
                 'results': [],
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
             
             urgency_level = alert_data.get('urgency_level', 'HIGH')
             
             # Prepare message content
+            if 'timestamp' not in alert_data:
+                alert_data = {**alert_data, 'timestamp': now_iso}
             sms_message = self._format_sms_message(alert_data)
-            email_subject = self._format_email_subject(alert_data)
-            email_body = self._format_email_body(alert_data)
-            push_title = alert_data.get('emergency_type', 'Health Emergency')
-            push_message = self._format_push_message(alert_data)
             
-            # Send SMS if phone number available
+            # Queue every enabled channel the contact can be reached on as
+            # (channel, send function, args), then send them concurrently;
+            # unconfigured channels are skipped rather than reported as failed
+            enabled = self._enabled_channels
+            channels = []
             if contact_info.get('phone_number'):
-                results['channels_attempted'] += 1
-                sms_result = self.send_sms(
-                    contact_info['phone_number'], 
-                    sms_message, 
-                    urgency_level
-                )
-                results['results'].append({
-                    'channel': 'sms',
-                    'success': sms_result['success'],
-                    'details': sms_result
-                })
-                if sms_result['success']:
-                    results['channels_successful'] += 1
-            
-            # Send email if email address available
+                channels.append(('sms', self.send_sms, (
+                    contact_info['phone_number'], sms_message, urgency_level
+                )))
             if contact_info.get('email'):
-                results['channels_attempted'] += 1
-                html_body = self._format_html_email(alert_data)
-                email_result = self.send_email(
-                    contact_info['email'], 
-                    email_subject, 
-                    email_body, 
+                channels.append(('email', self.send_email, (
+                    contact_info['email'],
+                    self._format_email_subject(alert_data),
+                    self._format_email_body(alert_data),
                     urgency_level,
-                    html_body
-                )
-                results['results'].append({
-                    'channel': 'email',
-                    'success': email_result['success'],
-                    'details': email_result
-                })
-                if email_result['success']:
-                    results['channels_successful'] += 1
-            
-            # Send push notification if patient ID available
-            if contact_info.get('patient_id'):
-                results['channels_attempted'] += 1
-                push_result = self.send_push_notification(
-                    contact_info['patient_id'], 
-                    push_title, 
-                    push_message, 
+                    self._format_html_email(alert_data)
+                )))
+            if 'push' in enabled and contact_info.get('patient_id'):
+                channels.append(('push', self.send_push_notification, (
+                    contact_info['patient_id'],
+                    alert_data.get('emergency_type', 'Health Emergency'),
+                    self._format_push_message(alert_data),
                     urgency_level
-                )
-                results['results'].append({
-                    'channel': 'push',
-                    'success': push_result['success'],
-                    'details': push_result
-                })
-                if push_result['success']:
-                    results['channels_successful'] += 1
+                )))
+            # Voice calls only for critical emergencies
+            if 'voice' in enabled and urgency_level == 'CRITICAL' and contact_info.get('phone_number'):
+                channels.append(('voice', self.send_voice_call, (
+                    contact_info['phone_number'], sms_message, urgency_level
+                )))
+            
+            pending = [
+                (channel, CHANNEL_EXECUTOR.submit(send, *args, timestamp=now_iso))
+                for channel, send, args in channels
+            ]
             
-            # Send voice call for critical emergencies
-            if urgency_level == 'CRITICAL' and contact_info.get('phone_number'):
+            # Collect in submission order so results keep their channel order
+            for channel, future in pending:
                 results['channels_attempted'] += 1
-                voice_result = self.send_voice_call(
-                    contact_info['phone_number'], 
-                    sms_message, 
-                    urgency_level
-                )
+                try:
+                    channel_result = future.result()
+                except Exception as e:
+                    logger.error("Error sending %s notification: %s", channel, e)
+                    channel_result = {
+                        'success': False,
+                        'error': str(e),
+                        'timestamp': now_iso
+                    }
                 results['results'].append({
-                    'channel': 'voice',
-                    'success': voice_result['success'],
-                    'details': voice_result
+                    'channel': channel,
+                    'success': channel_result['success'],
+                    'details': channel_result
                 })
-                if voice_result['success']:
+                if channel_result['success']:
                     results['channels_successful'] += 1
             
             # Calculate success rate
@@ -556,58 +972,51 @@ class NotificationService:
             )
             
             logger.info(
-                f"Multi-channel notification completed: "
-                f"{results['channels_successful']}/{results['channels_attempted']} successful"
+                "Multi-channel notification completed: %s/%s successful",
+                results['channels_successful'], results['channels_attempted']
             )
             
             return results
             
         except Exception as e:
-            logger.error(f"Multi-channel notification error: {str(e)}")
+            logger.error("Multi-channel notification error: %s", e)
             return {
                 'channels_attempted': 0,
                 'channels_successful': 0,
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             }
     
     def _format_phone_number(self, phone_number: str) -> Optional[str]:
         """Format and validate phone number"""
         
-        try:
-            # Parse phone number
-            parsed = phonenumbers.parse(phone_number, "US")
-            
-            # Validate phone number
-            if phonenumbers.is_valid_number(parsed):
-                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-            else:
-                return None
-                
-        except phonenumbers.NumberParseException:
-            return None
+        return format_phone_number(phone_number)
     
     def _validate_email(self, email: str) -> bool:
         """Validate email address format"""
         
+        # Addresses matching the basic pattern were always accepted, so only
+        # the rest need the full validator (which also does a DNS lookup)
+        if EMAIL_PATTERN.match(email):
+            return True
+        if validate_email is None:
+            return False
+        
         try:
-            from email_validator import validate_email
             validate_email(email)
             return True
-        except:
-            # Basic regex validation as fallback
-            import re
-            pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            return re.match(pattern, email) is not None
+        except EmailNotValidError:
+            return False
     
     def _format_sms_message(self, alert_data: Dict[str, Any]) -> str:
         """Format SMS message based on alert data"""
         
         urgency_level = alert_data.get('urgency_level', 'HIGH')
-        template = self.templates['emergency_sms'].get(urgency_level.lower(), 
-                                                      self.templates['emergency_sms']['high'])
+        sms_templates = self._sms_templates
+        template = sms_templates.get(urgency_level) or sms_templates.get(urgency_level.upper(), 
+                                                                        sms_templates['HIGH'])
         
-        return template.format(
+        return template.substitute(
             patient_id=alert_data.get('patient_id', 'Unknown'),
             emergency_type=alert_data.get('emergency_type', 'Health Emergency'),
             location=alert_data.get('location', 'Unknown Location'),
@@ -617,7 +1026,7 @@ class NotificationService:
     def _format_email_subject(self, alert_data: Dict[str, Any]) -> str:
         """Format email subject based on alert data"""
         
-        return self.templates['emergency_email']['subject'].format(
+        return self._email_subject_tmpl.format(
             urgency_level=alert_data.get('urgency_level', 'HIGH'),
             patient_id=alert_data.get('patient_id', 'Unknown')
         )
@@ -631,10 +1040,10 @@ EMERGENCY HEALTH ALERT
 Patient ID: {alert_data.get('patient_id', 'Unknown')}
 Alert Level: {alert_data.get('urgency_level', 'HIGH')}
 Emergency Type: {alert_data.get('emergency_type', 'Health Emergency')}
-Time: {alert_data.get('timestamp', datetime.now(timezone.utc).isoformat())}
+Time: {alert_data.get('timestamp') or datetime.now(timezone.utc).isoformat()}
 
 Health Data:
-{json.dumps(alert_data.get('health_data', {}), indent=2)}
+{orjson.dumps(alert_data.get('health_data', {}), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()}
 
 This is an automated emergency alert from HealthConnect AI.
 Please take immediate action and contact emergency services if necessary.
@@ -646,38 +1055,28 @@ Alert ID: {alert_data.get('alert_id', 'N/A')}
         """Format HTML email body"""
         
         urgency_level = alert_data.get('urgency_level', 'HIGH')
-        urgency_class = urgency_level.lower()
+        urgency_class = URGENCY_KEY.get(urgency_level) or urgency_level.lower()
         
         # Format health data as HTML
         health_data = alert_data.get('health_data', {})
-        health_data_html = "<ul>"
-        for key, value in health_data.items():
-            health_data_html += f"<li><strong>{key.replace('_', ' ').title()}:</strong> {value}</li>"
-        health_data_html += "</ul>"
-        
-        # Format actions as HTML
-        actions = [
-            "Contact emergency services if needed",
-            "Monitor patient continuously",
-            "Document all observations",
-            "Stay with patient until help arrives"
-        ]
-        actions_html = "<ul>"
-        for action in actions:
-            actions_html += f"<li>{action}</li>"
-        actions_html += "</ul>"
-        
-        return self.templates['emergency_email']['body_template'].format(
-            urgency_level=urgency_level,
-            urgency_class=urgency_class,
-            patient_id=alert_data.get('patient_id', 'Unknown'),
-            alert_id=alert_data.get('alert_id', 'N/A'),
-            emergency_type=alert_data.get('emergency_type', 'Health Emergency'),
-            timestamp=alert_data.get('timestamp', datetime.now(timezone.utc).isoformat()),
-            source=alert_data.get('source', 'System'),
-            health_data_html=health_data_html,
-            actions_html=actions_html
-        )
+        health_data_html = '<ul>' + ''.join(
+            f"<li><strong>{escape(key.replace('_', ' ').title())}:</strong> {escape(str(value))}</li>"
+            for key, value in health_data.items()
+        ) + '</ul>'
+        
+        # Alert fields come from API callers and devices; escape them so
+        # they render as text rather than markup
+        return self._email_body_head + self._email_body_tmpl.format_map({
+            'urgency_level': escape(urgency_level),
+            'urgency_class': escape(urgency_class),
+            'patient_id': escape(str(alert_data.get('patient_id', 'Unknown'))),
+            'alert_id': escape(str(alert_data.get('alert_id', 'N/A'))),
+            'emergency_type': escape(str(alert_data.get('emergency_type', 'Health Emergency'))),
+            'timestamp': escape(str(alert_data.get('timestamp') or datetime.now(timezone.utc).isoformat())),
+            'source': escape(str(alert_data.get('source', 'System'))),
+            'health_data_html': health_data_html,
+            'actions_html': EMAIL_ACTIONS_HTML
+        })
     
     def _format_push_message(self, alert_data: Dict[str, Any]) -> str:
         """Format push notification message"""
@@ -1,23 +1,225 @@
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import hashlib
+import math
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Callable, Tuple
 import boto3
-from botocore.exceptions import ClientError
+import orjson
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from pydantic import BaseModel, ConfigDict, ValidationError
 import os
 
 logger = logging.getLogger(__name__)
 
+# Exact-match analysis cache: inputs that agree on binned vitals, on which
+# side of each clinical threshold every vital falls, and on the
+# normalized symptom, history and medication text reuse one Bedrock analysis.
+# Symptom text is part of the key verbatim, so red-flag findings never share
+# an entry with milder wording.
+ANALYSIS_CACHE_TABLE = os.environ.get('ANALYSIS_CACHE_TABLE')
+ANALYSIS_CACHE_TTL = int(os.environ.get('ANALYSIS_CACHE_TTL', '3600'))
+VITAL_SIGN_BINS = (
+    ('heart_rate', 10),
+    ('temperature', 0.5),
+    ('oxygen_saturation', 1),
+    ('respiratory_rate', 2)
+)
+BLOOD_PRESSURE_BIN = 10
+
+# Clinical thresholds as (low, high) cutoffs, matching the risk scorer and
+# the normal ranges in handler.py. Each vital's band (how many low cutoffs
+# it is below, or high cutoffs it is above) is part of the cache key, so
+# values on either side of a threshold (HR 100 vs 109, temperature 38.0 vs
+# 38.4, systolic 140 vs 149) never share an entry even within one bin.
+VITAL_SIGN_THRESHOLDS = {
+    'heart_rate': ((50, 60), (100, 120)),
+    'temperature': ((35.0, 36.0), (38.0, 39.5)),
+    'oxygen_saturation': ((95,), ()),
+    'respiratory_rate': ((12,), (20,))
+}
+BLOOD_PRESSURE_THRESHOLDS = {
+    'systolic': ((90,), (140, 180)),
+    'diastolic': ((60,), (90, 110))
+}
+
+# Bedrock batch inference for bulk runs: request bodies are written to S3
+# as JSONL and analyzed by one asynchronous job at batch pricing. The
+# records themselves are kept under batch-records/ so the completion
+# handler can pair each output with its patient.
+BATCH_INFERENCE_BUCKET = os.environ.get('BATCH_INFERENCE_BUCKET')
+BATCH_INFERENCE_ROLE_ARN = os.environ.get('BATCH_INFERENCE_ROLE_ARN')
+BATCH_INFERENCE_MIN_RECORDS = int(os.environ.get('BATCH_INFERENCE_MIN_RECORDS', '100'))
+
+def threshold_band(value: float, thresholds: Tuple[Tuple[float, ...], Tuple[float, ...]]) -> int:
+    """Signed count of the low cutoffs value is below or high cutoffs it is above"""
+    low, high = thresholds
+    return sum(value > cutoff for cutoff in high) - sum(value < cutoff for cutoff in low)
+
+def batch_submission_error(record_count: int) -> Optional[str]:
+    """Why a batch of record_count records can't be submitted, if it can't"""
+    if not BATCH_INFERENCE_BUCKET or not BATCH_INFERENCE_ROLE_ARN:
+        return "Batch inference is not configured"
+    if record_count < BATCH_INFERENCE_MIN_RECORDS:
+        return f"Batch inference requires at least {BATCH_INFERENCE_MIN_RECORDS} records"
+    return None
+
+MEDICAL_SYSTEM_PROMPT = """You are a highly skilled medical AI assistant with expertise in clinical assessment and diagnosis. 
+        
+Your role is to:
+1. Analyze patient symptoms, vital signs, and medical history
+2. Provide differential diagnoses based on clinical evidence
+3. Assess severity and urgency of the patient's condition
+4. Recommend appropriate immediate actions and follow-up care
+5. Identify red flag symptoms that require immediate attention
+
+Important guidelines:
+- Always prioritize patient safety
+- Be conservative in your assessments - when in doubt, recommend higher level of care
+- Provide evidence-based recommendations
+- Clearly indicate when emergency care is needed
+- Consider drug interactions and contraindications
+- Maintain professional medical terminology while being clear
+- Always recommend consulting with healthcare providers for definitive diagnosis and treatment
+
+Remember: You are providing clinical decision support, not replacing professional medical judgment."""
+
+# Scans for the analysis object inside free-form model output
+JSON_DECODER = json.JSONDecoder()
+
+# Prompt line per vital sign, in the order they are listed to the model
+VITAL_SIGN_LINES = (
+    ('heart_rate', "- Heart Rate: {} bpm\n"),
+    ('blood_pressure', "- Blood Pressure: {}/{} mmHg\n"),
+    ('temperature', "- Temperature: {}°C\n"),
+    ('oxygen_saturation', "- Oxygen Saturation: {}%\n"),
+    ('respiratory_rate', "- Respiratory Rate: {} breaths/min\n")
+)
+
+# Opt-in Bedrock prompt caching for the static system prompt; only models
+# that support cache_control accept it, and prompts under the model's
+# minimum cacheable length are processed uncached
+PROMPT_CACHING_ENABLED = os.environ.get('BEDROCK_PROMPT_CACHING', 'false').lower() == 'true'
+
+class Recommendation(BaseModel):
+    """Single recommendation in a structured analysis"""
+    model_config = ConfigDict(extra='allow')
+    
+    category: str = 'general'
+    action: str
+    priority: str = 'MEDIUM'
+    timeframe: str = '24h'
+
+class FollowUp(BaseModel):
+    """Follow-up requirement in a structured analysis"""
+    model_config = ConfigDict(extra='allow')
+    
+    required: bool
+    timeframe: Optional[str] = None
+    specialist: Optional[str] = None
+
+class AnalysisResult(BaseModel):
+    """Structured analysis returned by the model; extra fields are kept as-is"""
+    model_config = ConfigDict(extra='allow')
+    
+    primary_assessment: str
+    differential_diagnosis: List[str]
+    severity_level: str
+    recommendations: List[Recommendation]
+    immediate_actions: List[str] = []
+    red_flags: List[str] = []
+    follow_up: Optional[FollowUp] = None
+    confidence_level: Optional[float] = None
+
+# Consecutive Bedrock failures that open the circuit, and how long it stays
+# open before a trial call is let through
+BEDROCK_CIRCUIT_FAIL_MAX = int(os.environ.get('BEDROCK_CIRCUIT_FAIL_MAX', '10'))
+BEDROCK_CIRCUIT_RESET_TIMEOUT = float(os.environ.get('BEDROCK_CIRCUIT_RESET_TIMEOUT', '30'))
+
+# Streamed text is forwarded in batches: a flush once this many characters
+# are pending or this long after the previous flush, so each WebSocket post
+# carries many model deltas instead of a few tokens
+STREAM_FLUSH_CHARS = 200
+STREAM_FLUSH_SECONDS = 0.1
+
+class CircuitBreaker:
+    """Per-container circuit breaker that short-circuits calls after repeated failures"""
+    
+    def __init__(self, fail_max: int, reset_timeout: float):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Whether a call may go through"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: let this call through as a trial and keep
+                # concurrent callers out until it reports back
+                self.opened_at = time.monotonic()
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.fail_max:
+                self.opened_at = time.monotonic()
+
+BEDROCK_CIRCUIT = CircuitBreaker(BEDROCK_CIRCUIT_FAIL_MAX, BEDROCK_CIRCUIT_RESET_TIMEOUT)
+
+# Clients are created once per container so warm invocations reuse the
+# connection pool instead of rebuilding it for every analyzer; the pool is
+# sized so concurrent calls don't queue on connection checkout
+AWS_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=int(os.environ.get('BOTO_MAX_POOL', '50')),
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+BEDROCK_RUNTIME = boto3.client(
+    'bedrock-runtime',
+    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+    config=AWS_CONFIG.merge(Config(retries={'max_attempts': 5, 'mode': 'adaptive'}))
+)
+# Batch jobs live on the control-plane client, not bedrock-runtime
+BEDROCK = boto3.client('bedrock', region_name=os.environ.get('AWS_REGION', 'us-east-1'), config=AWS_CONFIG)
+S3 = boto3.client('s3', config=AWS_CONFIG)
+ANALYSIS_CACHE = boto3.resource('dynamodb', config=AWS_CONFIG).Table(ANALYSIS_CACHE_TABLE) if ANALYSIS_CACHE_TABLE else None
+
 class BedrockHealthAnalyzer:
     """Production-grade AWS Bedrock client for health analysis"""
     
     def __init__(self):
-        self.bedrock_runtime = boto3.client(
-            'bedrock-runtime',
-            region_name=os.environ.get('AWS_REGION', 'us-east-1')
-        )
+        self.bedrock_runtime = BEDROCK_RUNTIME
+        self.bedrock = BEDROCK
+        self.s3 = S3
         self.model_id = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
         self.max_tokens = 4000
         self.temperature = 0.1  # Low temperature for medical accuracy
+        self.cache_table = ANALYSIS_CACHE
+        
+        # Everything but the user message is identical across requests
+        system_prompt = MEDICAL_SYSTEM_PROMPT
+        if PROMPT_CACHING_ENABLED:
+            system_prompt = [{"type": "text", "text": MEDICAL_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+        self.request_template = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "system": system_prompt
+        }
         
     def analyze_health_data(self, health_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -30,37 +232,44 @@ class BedrockHealthAnalyzer:
             Dictionary containing analysis results and recommendations
         """
         try:
-            # Construct medical analysis prompt
-            prompt = self._build_medical_prompt(health_data)
+            # Clinically equivalent inputs skip the Bedrock round-trip
+            cache_key = self._cache_key(health_data) if self.cache_table else None
+            if cache_key:
+                cached = self._get_cached_analysis(cache_key)
+                if cached:
+                    return cached
             
-            # Prepare request body according to Claude 3 API specification
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": self.max_tokens,
-                "temperature": self.temperature,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "system": self._get_medical_system_prompt()
-            }
+            # While Bedrock keeps failing, answer with the fallback instead
+            # of adding to the throttling
+            if not BEDROCK_CIRCUIT.allow():
+                logger.warning("Bedrock circuit open, returning fallback analysis")
+                return {**self._fallback_analysis(''), 'circuit_open': True}
             
             # Invoke Bedrock model
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body),
-                contentType='application/json',
-                accept='application/json'
-            )
+            try:
+                response = self.bedrock_runtime.invoke_model(
+                    modelId=self.model_id,
+                    body=orjson.dumps(self._build_request_body(health_data)),
+                    contentType='application/json',
+                    accept='application/json'
+                )
+                response_body = orjson.loads(response['body'].read())
+            except (ClientError, BotoCoreError):
+                BEDROCK_CIRCUIT.record_failure()
+                raise
+            BEDROCK_CIRCUIT.record_success()
             
             # Parse response
-            response_body = json.loads(response['body'].read())
             analysis_text = response_body['content'][0]['text']
             
             # Parse structured response
-            return self._parse_analysis_response(analysis_text)
+            analysis = self._parse_analysis_response(analysis_text)
+            
+            # Only cache responses that parsed; fallbacks carry raw output
+            if cache_key and 'raw_response' not in analysis:
+                self._put_cached_analysis(cache_key, analysis)
+            
+            return analysis
             
         except ClientError as e:
             logger.error(f"Bedrock API error: {str(e)}")
@@ -69,42 +278,302 @@ class BedrockHealthAnalyzer:
             logger.error(f"Error in health analysis: {str(e)}")
             raise
     
+    def analyze_health_data_stream(
+        self,
+        health_data: Dict[str, Any],
+        on_delta: Callable[[str], None]
+    ) -> Dict[str, Any]:
+        """
+        Analyze health data, passing the text to on_delta in batches as
+        Bedrock generates it
+        
+        Args:
+            health_data: Dictionary containing symptoms, vital signs, history, medications
+            on_delta: Called with each batch of generated text
+            
+        Returns:
+            Dictionary containing analysis results and recommendations
+        """
+        try:
+            # A cached analysis has nothing to stream; deliver it whole
+            cache_key = self._cache_key(health_data) if self.cache_table else None
+            if cache_key:
+                cached = self._get_cached_analysis(cache_key)
+                if cached:
+                    on_delta(orjson.dumps(cached).decode())
+                    return cached
+            
+            if not BEDROCK_CIRCUIT.allow():
+                logger.warning("Bedrock circuit open, returning fallback analysis")
+                return {**self._fallback_analysis(''), 'circuit_open': True}
+            
+            # Stream errors (e.g. throttling) surface while iterating
+            parts = []
+            pending = []
+            pending_chars = 0
+            last_flush = time.monotonic()
+            try:
+                response = self.bedrock_runtime.invoke_model_with_response_stream(
+                    modelId=self.model_id,
+                    body=orjson.dumps(self._build_request_body(health_data)),
+                    contentType='application/json',
+                    accept='application/json'
+                )
+                for event in response['body']:
+                    chunk = orjson.loads(event['chunk']['bytes'])
+                    if chunk['type'] == 'content_block_delta':
+                        text = chunk['delta'].get('text', '')
+                        if text:
+                            parts.append(text)
+                            pending.append(text)
+                            pending_chars += len(text)
+                            now = time.monotonic()
+                            if pending_chars >= STREAM_FLUSH_CHARS or now - last_flush >= STREAM_FLUSH_SECONDS:
+                                on_delta(''.join(pending))
+                                pending.clear()
+                                pending_chars = 0
+                                last_flush = now
+                    elif chunk['type'] == 'message_stop':
+                        break
+            except (ClientError, BotoCoreError):
+                BEDROCK_CIRCUIT.record_failure()
+                raise
+            BEDROCK_CIRCUIT.record_success()
+            
+            # Deliver whatever arrived after the last flush
+            if pending:
+                on_delta(''.join(pending))
+            
+            # The structured result is parsed once the full text has arrived
+            analysis = self._parse_analysis_response(''.join(parts))
+            
+            if cache_key and 'raw_response' not in analysis:
+                self._put_cached_analysis(cache_key, analysis)
+            
+            return analysis
+            
+        except ClientError as e:
+            logger.error(f"Bedrock API error: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error in streaming health analysis: {str(e)}")
+            raise
+    
+    def submit_batch(self, records: List[Dict[str, Any]]) -> str:
+        """
+        Submit health analyses as one Bedrock batch inference job
+        
+        Args:
+            records: Dictionaries with a unique record_id, the patient_id and the health_data to analyze
+            
+        Returns:
+            ARN of the model invocation job
+        """
+        error = batch_submission_error(len(records))
+        if error:
+            raise ValueError(error)
+        
+        try:
+            job_name = f"health-analysis-{int(time.time())}-{uuid.uuid4().hex[:8]}"
+            input_key = f"batch-input/{job_name}.jsonl"
+            
+            self.s3.put_object(
+                Bucket=BATCH_INFERENCE_BUCKET,
+                Key=f"batch-records/{job_name}.jsonl",
+                Body=b'\n'.join(map(orjson.dumps, records)),
+                ContentType='application/jsonl'
+            )
+            
+            body = b'\n'.join(
+                orjson.dumps({
+                    'recordId': record['record_id'],
+                    'modelInput': self._build_request_body(record['health_data'])
+                })
+                for record in records
+            )
+            self.s3.put_object(
+                Bucket=BATCH_INFERENCE_BUCKET,
+                Key=input_key,
+                Body=body,
+                ContentType='application/jsonl'
+            )
+            
+            response = self.bedrock.create_model_invocation_job(
+                jobName=job_name,
+                roleArn=BATCH_INFERENCE_ROLE_ARN,
+                modelId=self.model_id,
+                inputDataConfig={
+                    's3InputDataConfig': {'s3Uri': f"s3://{BATCH_INFERENCE_BUCKET}/{input_key}"}
+                },
+                outputDataConfig={
+                    's3OutputDataConfig': {'s3Uri': f"s3://{BATCH_INFERENCE_BUCKET}/batch-output/"}
+                }
+            )
+            
+            logger.info(f"Submitted batch analysis job {job_name} with {len(records)} records")
+            return response['jobArn']
+            
+        except ClientError as e:
+            logger.error(f"Bedrock batch submission error: {str(e)}")
+            raise
+    
+    def get_batch_job(self, job_arn: str) -> Dict[str, Any]:
+        """Return the status of a batch inference job"""
+        response = self.bedrock.get_model_invocation_job(jobIdentifier=job_arn)
+        return {
+            'job_arn': job_arn,
+            'job_name': response['jobName'],
+            'status': response['status'],
+            'message': response.get('message'),
+            'output_uri': response['outputDataConfig']['s3OutputDataConfig']['s3Uri']
+        }
+    
+    def collect_batch(self, job_arn: str) -> List[Dict[str, Any]]:
+        """
+        Read the results of a finished batch inference job
+        
+        Args:
+            job_arn: ARN of a job submitted with submit_batch
+            
+        Returns:
+            The submitted records, each with the parsed analysis added
+        """
+        job = self.get_batch_job(job_arn)
+        
+        records_body = self.s3.get_object(
+            Bucket=BATCH_INFERENCE_BUCKET,
+            Key=f"batch-records/{job['job_name']}.jsonl"
+        )['Body'].read()
+        records = {record['record_id']: record for record in map(orjson.loads, records_body.splitlines())}
+        
+        # Bedrock writes one .out file per input file under the job ID
+        output_prefix = f"batch-output/{job_arn.rsplit('/', 1)[-1]}/"
+        paginator = self.s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=BATCH_INFERENCE_BUCKET, Prefix=output_prefix):
+            for obj in page.get('Contents', []):
+                if not obj['Key'].endswith('.jsonl.out'):
+                    continue
+                output_body = self.s3.get_object(Bucket=BATCH_INFERENCE_BUCKET, Key=obj['Key'])['Body'].read()
+                for line in output_body.splitlines():
+                    output = orjson.loads(line)
+                    record = records.get(output.get('recordId'))
+                    if record is None:
+                        continue
+                    if 'modelOutput' in output:
+                        record['analysis'] = self._parse_analysis_response(output['modelOutput']['content'][0]['text'])
+                    else:
+                        logger.error(f"Batch record {output['recordId']} failed: {output.get('error')}")
+        
+        # Records without a usable output still get the conservative analysis
+        for record_id, record in records.items():
+            if 'analysis' not in record:
+                logger.warning(f"No usable batch output for record {record_id}, using fallback analysis")
+                record['analysis'] = self._fallback_analysis('')
+        
+        return list(records.values())
+    
+    def _build_request_body(self, health_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the Claude 3 messages request body for a health analysis"""
+        return {
+            **self.request_template,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": self._build_medical_prompt(health_data)
+                }
+            ]
+        }
+    
+    def _cache_key(self, health_data: Dict[str, Any]) -> Optional[str]:
+        """Hash binned vitals and normalized clinical text into a cache key"""
+        try:
+            vs = health_data.get('vital_signs') or {}
+            vitals = [
+                (name, math.floor(float(vs[name]) / width), threshold_band(float(vs[name]), VITAL_SIGN_THRESHOLDS[name]))
+                for name, width in VITAL_SIGN_BINS if name in vs
+            ]
+            if 'blood_pressure' in vs:
+                bp = vs['blood_pressure']
+                systolic = float(bp.get('systolic', 0))
+                diastolic = float(bp.get('diastolic', 0))
+                vitals.append((
+                    'blood_pressure',
+                    math.floor(systolic / BLOOD_PRESSURE_BIN),
+                    math.floor(diastolic / BLOOD_PRESSURE_BIN),
+                    threshold_band(systolic, BLOOD_PRESSURE_THRESHOLDS['systolic']),
+                    threshold_band(diastolic, BLOOD_PRESSURE_THRESHOLDS['diastolic'])
+                ))
+            
+            canonical = (
+                vitals,
+                sorted({str(symptom.get('text', '')).strip().lower() for symptom in health_data.get('symptoms') or []}),
+                sorted({str(condition).strip().lower() for condition in health_data.get('medical_history') or []}),
+                sorted({str(medication).strip().lower() for medication in health_data.get('medications') or []})
+            )
+        except (TypeError, ValueError, AttributeError):
+            # Vitals that aren't numeric can't be binned; analyze uncached
+            return None
+        
+        return hashlib.sha256(orjson.dumps(canonical)).hexdigest()
+    
+    def _get_cached_analysis(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis that has not yet expired"""
+        try:
+            item = self.cache_table.get_item(Key={'cache_key': cache_key}).get('Item')
+        except ClientError as e:
+            logger.warning(f"Analysis cache read failed: {str(e)}")
+            return None
+        
+        # DynamoDB deletes expired items lazily, so check the TTL here
+        if not item or item['ttl'] <= time.time():
+            return None
+        return orjson.loads(item['analysis'])
+    
+    def _put_cached_analysis(self, cache_key: str, analysis: Dict[str, Any]) -> None:
+        """Store an analysis under its cache key"""
+        try:
+            self.cache_table.put_item(Item={
+                'cache_key': cache_key,
+                'analysis': orjson.dumps(analysis).decode(),
+                'ttl': int(time.time()) + ANALYSIS_CACHE_TTL
+            })
+        except ClientError as e:
+            logger.warning(f"Analysis cache write failed: {str(e)}")
+    
     def _build_medical_prompt(self, health_data: Dict[str, Any]) -> str:
         """Build comprehensive medical analysis prompt"""
         
         symptoms_text = ""
         if health_data.get('symptoms'):
-            symptoms_text = "Symptoms:\n"
-            for symptom in health_data['symptoms']:
-                symptoms_text += f"- {symptom.get('text', '')}\n"
+            symptoms_text = "Symptoms:\n" + "".join(
+                f"- {symptom.get('text', '')}\n" for symptom in health_data['symptoms']
+            )
         
         vital_signs_text = ""
         if health_data.get('vital_signs'):
-            vital_signs_text = "Vital Signs:\n"
             vs = health_data['vital_signs']
-            if 'heart_rate' in vs:
-                vital_signs_text += f"- Heart Rate: {vs['heart_rate']} bpm\n"
-            if 'blood_pressure' in vs:
-                bp = vs['blood_pressure']
-                vital_signs_text += f"- Blood Pressure: {bp.get('systolic', 'N/A')}/{bp.get('diastolic', 'N/A')} mmHg\n"
-            if 'temperature' in vs:
-                vital_signs_text += f"- Temperature: {vs['temperature']}°C\n"
-            if 'oxygen_saturation' in vs:
-                vital_signs_text += f"- Oxygen Saturation: {vs['oxygen_saturation']}%\n"
-            if 'respiratory_rate' in vs:
-                vital_signs_text += f"- Respiratory Rate: {vs['respiratory_rate']} breaths/min\n"
+            lines = ["Vital Signs:\n"]
+            for key, line_format in VITAL_SIGN_LINES:
+                if key not in vs:
+                    continue
+                if key == 'blood_pressure':
+                    bp = vs[key]
+                    lines.append(line_format.format(bp.get('systolic', 'N/A'), bp.get('diastolic', 'N/A')))
+                else:
+                    lines.append(line_format.format(vs[key]))
+            vital_signs_text = "".join(lines)
         
         history_text = ""
         if health_data.get('medical_history'):
-            history_text = "Medical History:\n"
-            for condition in health_data['medical_history']:
-                history_text += f"- {condition}\n"
+            history_text = "Medical History:\n" + "".join(
+                f"- {condition}\n" for condition in health_data['medical_history']
+            )
         
         medications_text = ""
         if health_data.get('medications'):
-            medications_text = "Current Medications:\n"
-            for medication in health_data['medications']:
-                medications_text += f"- {medication}\n"
+            medications_text = "Current Medications:\n" + "".join(
+                f"- {medication}\n" for medication in health_data['medications']
+            )
         
         prompt = f"""
 Please analyze the following patient health data and provide a comprehensive medical assessment:
@@ -142,74 +611,51 @@ Please provide your analysis in the following JSON format:
 """
         return prompt
     
-    def _get_medical_system_prompt(self) -> str:
-        """Get system prompt for medical analysis"""
-        return """You are a highly skilled medical AI assistant with expertise in clinical assessment and diagnosis. 
-        
-Your role is to:
-1. Analyze patient symptoms, vital signs, and medical history
-2. Provide differential diagnoses based on clinical evidence
-3. Assess severity and urgency of the patient's condition
-4. Recommend appropriate immediate actions and follow-up care
-5. Identify red flag symptoms that require immediate attention
-
-Important guidelines:
-- Always prioritize patient safety
-- Be conservative in your assessments - when in doubt, recommend higher level of care
-- Provide evidence-based recommendations
-- Clearly indicate when emergency care is needed
-- Consider drug interactions and contraindications
-- Maintain professional medical terminology while being clear
-- Always recommend consulting with healthcare providers for definitive diagnosis and treatment
-
-Remember: You are providing clinical decision support, not replacing professional medical judgment."""
-    
     def _parse_analysis_response(self, analysis_text: str) -> Dict[str, Any]:
         """Parse structured analysis response from Claude"""
         try:
-            # Find JSON block in response
+            # Decode from each '{' in turn so stray braces in the surrounding
+            # prose can't corrupt the JSON block; the first complete object
+            # that validates as an analysis wins
+            first_error: Optional[Exception] = None
             start_idx = analysis_text.find('{')
-            end_idx = analysis_text.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("No JSON found in response")
-            
-            json_str = analysis_text[start_idx:end_idx]
-            parsed_response = json.loads(json_str)
-            
-            # Validate required fields
-            required_fields = ['primary_assessment', 'differential_diagnosis', 'severity_level', 'recommendations']
-            for field in required_fields:
-                if field not in parsed_response:
-                    logger.warning(f"Missing required field in analysis: {field}")
+            while start_idx != -1:
+                try:
+                    parsed, _ = JSON_DECODER.raw_decode(analysis_text, start_idx)
+                    return AnalysisResult.model_validate(parsed).model_dump(exclude_unset=True)
+                except (ValidationError, ValueError) as e:
+                    first_error = first_error or e
+                start_idx = analysis_text.find('{', start_idx + 1)
+            raise first_error or ValueError("No JSON found in response")
             
-            return parsed_response
-            
-        except (json.JSONDecodeError, ValueError) as e:
+        except (ValidationError, ValueError) as e:
             logger.error(f"Failed to parse analysis response: {str(e)}")
-            # Return fallback response
-            return {
-                "primary_assessment": "Analysis completed - please review raw output",
-                "differential_diagnosis": ["Unable to parse structured diagnosis"],
-                "severity_level": "MODERATE",
-                "immediate_actions": ["Consult healthcare provider"],
-                "recommendations": [
-                    {
-                        "category": "general",
-                        "action": "Seek professional medical evaluation",
-                        "priority": "HIGH",
-                        "timeframe": "24h"
-                    }
-                ],
-                "red_flags": [],
-                "follow_up": {
-                    "required": True,
-                    "timeframe": "24 hours",
-                    "specialist": "primary care physician"
-                },
-                "confidence_level": 0.5,
-                "raw_response": analysis_text
-            }
+            return self._fallback_analysis(analysis_text)
+    
+    def _fallback_analysis(self, analysis_text: str) -> Dict[str, Any]:
+        """Conservative analysis used when no structured result is available"""
+        return {
+            "primary_assessment": "Analysis completed - please review raw output",
+            "differential_diagnosis": ["Unable to parse structured diagnosis"],
+            "severity_level": "MODERATE",
+            "immediate_actions": ["Consult healthcare provider"],
+            "recommendations": [
+                {
+                    "category": "general",
+                    "action": "Seek professional medical evaluation",
+                    "priority": "HIGH",
+                    "timeframe": "24h"
+                }
+            ],
+            "red_flags": [],
+            "follow_up": {
+                "required": True,
+                "timeframe": "24 hours",
+                "specialist": "primary care physician"
+            },
+            "confidence_level": 0.5,
+            "raw_response": analysis_text
+        }
     
     def get_health_insights(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate health insights and wellness recommendations"""
@@ -238,12 +684,12 @@ Remember: You are providing clinical decision support, not replacing professiona
             
             response = self.bedrock_runtime.invoke_model(
                 modelId=self.model_id,
-                body=json.dumps(request_body),
+                body=orjson.dumps(request_body),
                 contentType='application/json',
                 accept='application/json'
             )
             
-            response_body = json.loads(response['body'].read())
+            response_body = orjson.loads(response['body'].read())
             return {"insights": response_body['content'][0]['text']}
             
         except Exception as e:
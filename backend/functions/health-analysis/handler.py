@@ -1,11 +1,20 @@
-import json
 import logging
 import os
-from typing import Dict, Any, List, Optional
+import re
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+from functools import lru_cache
 import boto3
+import numpy as np
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
-from bedrock_client import BedrockHealthAnalyzer
+from bedrock_client import BedrockHealthAnalyzer, batch_submission_error
 from medical_nlp import MedicalNLPProcessor
 import traceback
 
@@ -13,16 +22,101 @@ import traceback
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-sns = boto3.client('sns')
-eventbridge = boto3.client('events')
+# Initialize AWS clients; the pool is sized so concurrent calls don't
+# queue on connection checkout
+AWS_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=int(os.environ.get('BOTO_MAX_POOL', '50')),
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+dynamodb = boto3.resource('dynamodb', config=AWS_CONFIG)
 
 # Environment variables
 HEALTH_RECORDS_TABLE = os.environ['HEALTH_RECORDS_TABLE']
 ANALYSIS_RESULTS_TABLE = os.environ['ANALYSIS_RESULTS_TABLE']
-EMERGENCY_TOPIC_ARN = os.environ['EMERGENCY_TOPIC_ARN']
-EVENT_BUS_NAME = os.environ['EVENT_BUS_NAME']
+
+analysis_results_table = dynamodb.Table(ANALYSIS_RESULTS_TABLE)
+
+# Findings that raise the risk score; each list is compiled once into a
+# case-insensitive alternation. Entries are scanned together, joined by
+# ENTRY_SEPARATOR, and a match consumes the rest of its entry, so every
+# match found is a distinct matching entry
+HIGH_RISK_SYMPTOMS = ('chest pain', 'difficulty breathing', 'severe headache', 'confusion')
+HIGH_RISK_CONDITIONS = ('diabetes', 'hypertension', 'heart disease', 'stroke')
+ENTRY_SEPARATOR = '\x00'
+HIGH_RISK_SYMPTOM_PATTERN = re.compile(f"(?:{'|'.join(map(re.escape, HIGH_RISK_SYMPTOMS))})[^{ENTRY_SEPARATOR}]*", re.IGNORECASE)
+HIGH_RISK_CONDITION_PATTERN = re.compile(f"(?:{'|'.join(map(re.escape, HIGH_RISK_CONDITIONS))})[^{ENTRY_SEPARATOR}]*", re.IGNORECASE)
+
+class VitalIdx(IntEnum):
+    """Column of each vital sign in a risk-scoring vitals array"""
+    HEART_RATE = 0
+    SYSTOLIC = 1
+    DIASTOLIC = 2
+    TEMPERATURE = 3
+
+@dataclass(slots=True, frozen=True)
+class RiskAssessment:
+    """Risk scores for one analysis"""
+    vital_signs_risk: float
+    symptom_risk: float
+    medical_history_risk: float
+    emergency_risk: float
+    overall_risk: float
+
+# Patient payload shape checked before any NLP or Bedrock work
+REQUIRED_FIELDS = ('patient_id', 'symptoms', 'vital_signs')
+FIELD_TYPES = (
+    ('symptoms', str),
+    ('vital_signs', dict),
+    ('medical_history', list),
+    ('medications', list)
+)
+NUMERIC_VITAL_SIGNS = ('heart_rate', 'temperature', 'oxygen_saturation', 'respiratory_rate')
+
+# Inclusive normal ranges; trivial_analysis only skips the model when every
+# vital sign present is listed here and within its range
+NORMAL_VITAL_RANGES = {
+    'heart_rate': (60, 100),
+    'temperature': (36.0, 38.0),
+    'oxygen_saturation': (95, 100),
+    'respiratory_rate': (12, 20)
+}
+NORMAL_BLOOD_PRESSURE_RANGES = {
+    'systolic': (90, 140),
+    'diastolic': (60, 90)
+}
+
+# Independent network round-trips (insights, batch NLP, multi-patient
+# analyses) run concurrently on a pool that survives across warm invocations
+EXECUTOR_WORKERS = 8
+EXECUTOR = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS)
+
+# A synchronous request has to answer inside API Gateway's 29 s limit (the
+# function timeout is 30 s). Multi-patient requests get as many patients as
+# the pool can analyze in that budget at ANALYSIS_SECONDS per analysis;
+# larger cohorts belong in batch_mode
+MULTI_PATIENT_BUDGET_SECONDS = float(os.environ.get('MULTI_PATIENT_BUDGET_SECONDS', '25'))
+ANALYSIS_SECONDS = float(os.environ.get('ANALYSIS_SECONDS', '20'))
+MAX_PATIENTS_PER_REQUEST = EXECUTOR_WORKERS * max(1, int(MULTI_PATIENT_BUDGET_SECONDS // ANALYSIS_SECONDS))
+
+def current_time() -> Tuple[int, str]:
+    """Epoch seconds and ISO-8601 string for the same instant"""
+    now = datetime.now(timezone.utc)
+    return int(now.timestamp()), now.isoformat()
+
+def dumps(obj: Any) -> str:
+    """Serialize to a JSON string; orjson returns bytes"""
+    return orjson.dumps(obj).decode()
+
+def to_dynamodb(value: Any) -> Any:
+    """Convert floats to Decimal; boto3's DynamoDB serializer rejects float"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: to_dynamodb(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_dynamodb(v) for v in value]
+    return value
 
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
@@ -35,28 +129,42 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     Returns:
         Dict containing status code and response body
     """
+    # One clock reading per invocation, so the analysis_id, stored
+    # timestamp, TTL and response all agree
+    now_ts, now_iso = current_time()
+    
     try:
         # Parse request body
         if 'body' in event:
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
+            body = orjson.loads(event['body']) if isinstance(event['body'], str) else event['body']
         else:
             body = event
             
-        # Validate required fields
-        required_fields = ['patient_id', 'symptoms', 'vital_signs']
-        for field in required_fields:
-            if field not in body:
-                return {
-                    'statusCode': 400,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Origin': '*'
-                    },
-                    'body': json.dumps({
-                        'error': f'Missing required field: {field}',
-                        'timestamp': datetime.now(timezone.utc).isoformat()
-                    })
-                }
+        # Bulk runs go to Bedrock batch inference instead of one
+        # invoke_model per patient
+        if body.get('batch_mode'):
+            return handle_batch_analysis(body.get('patients') or [], now_ts, now_iso)
+        
+        # Several patients in one request are analyzed concurrently and
+        # written with BatchWriteItem
+        if 'patients' in body:
+            return handle_multi_patient_analysis(body['patients'], now_ts, now_iso)
+        
+        # Validate required fields and their types before any NLP or
+        # Bedrock work
+        error = payload_error(body)
+        if error:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': dumps({
+                    'error': error,
+                    'timestamp': now_iso
+                })
+            }
         
         patient_id = body['patient_id']
         symptoms = body['symptoms']
@@ -70,55 +178,66 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         bedrock_analyzer = BedrockHealthAnalyzer()
         nlp_processor = MedicalNLPProcessor()
         
-        # Process symptoms with NLP
-        processed_symptoms = nlp_processor.extract_medical_entities(symptoms)
+        # Wellness insights don't depend on the analysis; when the caller
+        # sends a patient profile, that Bedrock call runs alongside NLP and
+        # the main analysis instead of after them
+        patient_profile = body.get('patient_profile')
+        insights_future = EXECUTOR.submit(bedrock_analyzer.get_health_insights, patient_profile) if patient_profile else None
         
-        # Perform health analysis using Bedrock
-        analysis_result = bedrock_analyzer.analyze_health_data({
-            'symptoms': processed_symptoms,
-            'vital_signs': vital_signs,
-            'medical_history': medical_history,
-            'medications': medications
-        })
+        request_context = event.get('requestContext') or {}
+        connection_id = request_context.get('connectionId')
+        if connection_id:
+            management_client = get_management_client(
+                f"https://{request_context['domainName']}/{request_context['stage']}"
+            )
         
-        # Calculate risk scores
-        risk_assessment = calculate_risk_scores(vital_signs, processed_symptoms, medical_history)
+        # No symptoms and normal vitals leave nothing for the model to
+        # assess; answer directly without NLP or Bedrock
+        analysis_result = trivial_analysis(symptoms, vital_signs, medical_history)
+        if analysis_result:
+            processed_symptoms = []
+        else:
+            # Process symptoms with NLP
+            processed_symptoms = nlp_processor.extract_medical_entities(symptoms)
+            
+            health_data = {
+                'symptoms': processed_symptoms,
+                'vital_signs': vital_signs,
+                'medical_history': medical_history,
+                'medications': medications
+            }
+            
+            # Perform health analysis using Bedrock; WebSocket callers receive
+            # the analysis text as it is generated instead of waiting for all of it
+            if connection_id:
+                analysis_result = bedrock_analyzer.analyze_health_data_stream(
+                    health_data,
+                    lambda text: post_to_connection(management_client, connection_id, {
+                        'type': 'analysis_delta',
+                        'text': text
+                    })
+                )
+            else:
+                analysis_result = bedrock_analyzer.analyze_health_data(health_data)
         
-        # Store analysis results
-        analysis_record = {
-            'analysis_id': f"{patient_id}_{int(datetime.now().timestamp())}",
-            'patient_id': patient_id,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'symptoms': processed_symptoms,
-            'vital_signs': vital_signs,
-            'analysis_result': analysis_result,
-            'risk_assessment': risk_assessment,
-            'recommendations': analysis_result.get('recommendations', []),
-            'urgency_level': determine_urgency_level(risk_assessment),
-            'ttl': int(datetime.now().timestamp()) + 31536000  # 1 year TTL
-        }
+        # Calculate risk scores and build the analysis record
+        analysis_record = build_analysis_record(patient_id, processed_symptoms, vital_signs, medical_history, analysis_result, now_ts, now_iso)
         
-        # Save to DynamoDB
-        table = dynamodb.Table(ANALYSIS_RESULTS_TABLE)
-        table.put_item(Item=analysis_record)
+        # Save to DynamoDB; the table stream fans the record out to the event
+        # bus, and to the emergency topic when dispatch_required, via Pipes
+        analysis_results_table.put_item(Item=to_dynamodb(analysis_record))
         
-        # Check for emergency conditions
-        if risk_assessment['emergency_risk'] > 0.8:
-            await handle_emergency_alert(patient_id, analysis_record)
+        # Prepare response
+        response_body = analysis_response(analysis_record)
         
-        # Send analysis complete event
-        await send_analysis_event(patient_id, analysis_record)
+        if insights_future:
+            try:
+                response_body['health_insights'] = insights_future.result()
+            except Exception as e:
+                logger.error(f"Failed to generate health insights: {str(e)}")
         
-        # Prepare response
-        response_body = {
-            'analysis_id': analysis_record['analysis_id'],
-            'patient_id': patient_id,
-            'analysis_result': analysis_result,
-            'risk_assessment': risk_assessment,
-            'urgency_level': analysis_record['urgency_level'],
-            'recommendations': analysis_result.get('recommendations', []),
-            'timestamp': analysis_record['timestamp']
-        }
+        if connection_id:
+            post_to_connection(management_client, connection_id, {'type': 'analysis_complete', **response_body})
         
         return {
             'statusCode': 200,
@@ -126,7 +245,7 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps(response_body)
+            'body': dumps(response_body)
         }
         
     except ClientError as e:
@@ -137,9 +256,9 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({
+            'body': dumps({
                 'error': 'AWS service error occurred',
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             })
         }
     except Exception as e:
@@ -151,69 +270,389 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({
+            'body': dumps({
                 'error': 'Internal server error',
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso
             })
         }
 
-def calculate_risk_scores(vital_signs: Dict, symptoms: List, medical_history: List) -> Dict[str, float]:
-    """Calculate comprehensive risk scores based on health data"""
+def handle_batch_analysis(patients: List[Dict[str, Any]], now_ts: int, now_iso: str) -> Dict[str, Any]:
+    """Submit many patients' health data as one Bedrock batch inference job"""
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*'
+    }
     
-    # Vital signs risk calculation
-    vital_risk = 0.0
-    if 'heart_rate' in vital_signs:
-        hr = vital_signs['heart_rate']
-        if hr < 60 or hr > 100:
-            vital_risk += 0.3
-        if hr < 50 or hr > 120:
-            vital_risk += 0.4
-            
+    # Reject undersized or unconfigured batches before paying for NLP
+    error = validate_patients(patients) or batch_submission_error(len(patients))
+    if error:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({
+                'error': error,
+                'timestamp': now_iso
+            })
+        }
+    
+    bedrock_analyzer = BedrockHealthAnalyzer()
+    nlp_processor = MedicalNLPProcessor()
+    
+    # Prompts need the NLP-processed symptoms; extract them concurrently
+    processed = list(EXECUTOR.map(nlp_processor.extract_medical_entities, [patient['symptoms'] for patient in patients]))
+    
+    records = [
+        {
+            'record_id': f"{patient['patient_id']}_{now_ts}_{index}",
+            'patient_id': patient['patient_id'],
+            'health_data': {
+                'symptoms': processed_symptoms,
+                'vital_signs': patient['vital_signs'],
+                'medical_history': patient.get('medical_history', []),
+                'medications': patient.get('medications', [])
+            }
+        }
+        for index, (patient, processed_symptoms) in enumerate(zip(patients, processed))
+    ]
+    
+    try:
+        job_arn = bedrock_analyzer.submit_batch(records)
+    except ValueError as e:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({
+                'error': str(e),
+                'timestamp': now_iso
+            })
+        }
+    
+    return {
+        'statusCode': 202,
+        'headers': headers,
+        'body': dumps({
+            'job_arn': job_arn,
+            'record_count': len(records),
+            'timestamp': now_iso
+        })
+    }
+
+def batch_analysis_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
+    """
+    Store the results of a finished Bedrock batch analysis job
+    
+    Args:
+        event: EventBridge "Batch Inference Job State Change" event
+        context: Lambda context object
+        
+    Returns:
+        Summary of the records stored for the job
+    """
+    detail = event.get('detail', {})
+    job_arn = detail.get('batchJobArn')
+    status = detail.get('status')
+    
+    if status not in ('Completed', 'PartiallyCompleted'):
+        logger.error(f"Batch analysis job {job_arn} ended with status {status}: {detail.get('failureMessage')}")
+        return {'job_arn': job_arn, 'status': status, 'stored': 0}
+    
+    now_ts, now_iso = current_time()
+    
+    records = BedrockHealthAnalyzer().collect_batch(job_arn)
+    analysis_records = [
+        build_analysis_record(
+            record['patient_id'],
+            record['health_data']['symptoms'],
+            record['health_data']['vital_signs'],
+            record['health_data']['medical_history'],
+            record['analysis'],
+            now_ts,
+            now_iso
+        )
+        for record in records
+    ]
+    
+    # Stored like any other analysis, so the results table stream raises
+    # the analysis events and emergency alerts for these records too
+    with analysis_results_table.batch_writer(overwrite_by_pkeys=['analysis_id']) as batch:
+        for analysis_record in analysis_records:
+            batch.put_item(Item=to_dynamodb(analysis_record))
+    
+    logger.info(f"Stored {len(analysis_records)} analyses from batch job {job_arn}")
+    
+    return {'job_arn': job_arn, 'status': status, 'stored': len(analysis_records)}
+
+def handle_multi_patient_analysis(patients: List[Dict[str, Any]], now_ts: int, now_iso: str) -> Dict[str, Any]:
+    """Analyze several patients concurrently and store the results in one batch write"""
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*'
+    }
+    
+    error = validate_patients(patients)
+    if not error and len(patients) > MAX_PATIENTS_PER_REQUEST:
+        error = f"At most {MAX_PATIENTS_PER_REQUEST} patients per request; use batch_mode for larger runs"
+    if error:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': dumps({
+                'error': error,
+                'timestamp': now_iso
+            })
+        }
+    
+    logger.info(f"Processing health analysis for {len(patients)} patients")
+    
+    bedrock_analyzer = BedrockHealthAnalyzer()
+    nlp_processor = MedicalNLPProcessor()
+    
+    def analyze_patient(patient: Dict[str, Any]) -> Dict[str, Any]:
+        medical_history = patient.get('medical_history', [])
+        analysis_result = trivial_analysis(patient['symptoms'], patient['vital_signs'], medical_history)
+        if analysis_result:
+            return build_analysis_record(patient['patient_id'], [], patient['vital_signs'], medical_history, analysis_result, now_ts, now_iso)
+        
+        processed_symptoms = nlp_processor.extract_medical_entities(patient['symptoms'])
+        analysis_result = bedrock_analyzer.analyze_health_data({
+            'symptoms': processed_symptoms,
+            'vital_signs': patient['vital_signs'],
+            'medical_history': medical_history,
+            'medications': patient.get('medications', [])
+        })
+        return build_analysis_record(patient['patient_id'], processed_symptoms, patient['vital_signs'], medical_history, analysis_result, now_ts, now_iso)
+    
+    # One failed or slow patient must not cost the others their analyses:
+    # each gets its own entry, and whatever is unfinished at the deadline
+    # is reported as timed out instead of outliving the request
+    futures = [EXECUTOR.submit(analyze_patient, patient) for patient in patients]
+    wait(futures, timeout=MULTI_PATIENT_BUDGET_SECONDS)
+    
+    analysis_records = []
+    analyses = []
+    for patient, future in zip(patients, futures):
+        if not future.done():
+            future.cancel()
+            logger.error(f"Health analysis timed out for patient: {patient['patient_id']}")
+            error = 'Analysis timed out'
+        elif future.exception():
+            logger.error(f"Health analysis failed for patient {patient['patient_id']}: {str(future.exception())}")
+            error = 'Analysis failed'
+        else:
+            analysis_record = future.result()
+            analysis_records.append(analysis_record)
+            analyses.append(analysis_response(analysis_record))
+            continue
+        analyses.append({'patient_id': patient['patient_id'], 'error': error})
+    
+    # BatchWriteItem sends up to 25 records per call and retries unprocessed
+    # items
+    with analysis_results_table.batch_writer(overwrite_by_pkeys=['analysis_id']) as batch:
+        for analysis_record in analysis_records:
+            batch.put_item(Item=to_dynamodb(analysis_record))
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': dumps({
+            'analyses': analyses,
+            'timestamp': now_iso
+        })
+    }
+
+def payload_error(payload: Dict[str, Any]) -> Optional[str]:
+    """Describe the first missing or mistyped field in a patient payload"""
+    for field in REQUIRED_FIELDS:
+        if field not in payload:
+            return f'Missing required field: {field}'
+    
+    for field, expected_type in FIELD_TYPES:
+        if field in payload and not isinstance(payload[field], expected_type):
+            return f'Invalid type for field: {field}'
+    
+    for field in ('medical_history', 'medications'):
+        if not all(isinstance(item, str) for item in payload.get(field, [])):
+            return f'Invalid type for field: {field}'
+    
+    vital_signs = payload['vital_signs']
+    for name in NUMERIC_VITAL_SIGNS:
+        if name in vital_signs and not is_number(vital_signs[name]):
+            return f'Invalid value for vital sign: {name}'
     if 'blood_pressure' in vital_signs:
         bp = vital_signs['blood_pressure']
-        systolic = bp.get('systolic', 120)
-        diastolic = bp.get('diastolic', 80)
-        if systolic > 140 or diastolic > 90:
-            vital_risk += 0.4
-        if systolic > 180 or diastolic > 110:
-            vital_risk += 0.6
-            
-    if 'temperature' in vital_signs:
-        temp = vital_signs['temperature']
-        if temp > 38.0 or temp < 36.0:
-            vital_risk += 0.2
-        if temp > 39.5 or temp < 35.0:
-            vital_risk += 0.5
-    
-    # Symptom severity risk
-    symptom_risk = 0.0
-    high_risk_symptoms = ['chest pain', 'difficulty breathing', 'severe headache', 'confusion']
-    for symptom in symptoms:
-        if any(hrs in symptom['text'].lower() for hrs in high_risk_symptoms):
-            symptom_risk += 0.4
-    
-    # Medical history risk
-    history_risk = 0.0
-    high_risk_conditions = ['diabetes', 'hypertension', 'heart disease', 'stroke']
-    for condition in medical_history:
-        if any(hrc in condition.lower() for hrc in high_risk_conditions):
-            history_risk += 0.2
-    
-    # Calculate overall emergency risk
-    emergency_risk = min(1.0, vital_risk + symptom_risk + (history_risk * 0.5))
+        if not isinstance(bp, dict) or not all(is_number(bp[key]) for key in ('systolic', 'diastolic') if key in bp):
+            return 'Invalid value for vital sign: blood_pressure'
+    
+    return None
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def validate_patients(patients: List[Dict[str, Any]]) -> Optional[str]:
+    """Return an error message when any patient's payload is invalid"""
+    for patient in patients:
+        if not isinstance(patient, dict):
+            return 'Invalid type for field: patients'
+        error = payload_error(patient)
+        if error:
+            return f"{error} (patient {patient.get('patient_id', 'unknown')})"
+    return None
+
+def within_ranges(values: Dict, ranges: Dict) -> bool:
+    """Whether every value has a normal range and falls inside it"""
+    return all(name in ranges and ranges[name][0] <= value <= ranges[name][1] for name, value in values.items())
+
+def vitals_within_normal_ranges(vital_signs: Dict) -> bool:
+    """Whether every vital sign present is one we range-check and is normal"""
+    vitals = dict(vital_signs)
+    blood_pressure = vitals.pop('blood_pressure', {})
+    return within_ranges(vitals, NORMAL_VITAL_RANGES) and within_ranges(blood_pressure, NORMAL_BLOOD_PRESSURE_RANGES)
+
+def trivial_analysis(symptoms: str, vital_signs: Dict, medical_history: List) -> Optional[Dict[str, Any]]:
+    """Canned low-severity analysis for input with no symptoms and only normal vital signs"""
+    # The risk scorer doesn't look at SpO2 or respiratory rate, so a vital
+    # sign is only trusted here once it has been checked against its range
+    if symptoms.strip() or not vitals_within_normal_ranges(vital_signs):
+        return None
+    
+    risk = calculate_risk_scores(vital_signs, [], medical_history)
+    if risk.vital_signs_risk > 0 or risk.overall_risk >= 0.1:
+        return None
     
     return {
-        'vital_signs_risk': min(1.0, vital_risk),
-        'symptom_risk': min(1.0, symptom_risk),
-        'medical_history_risk': min(1.0, history_risk),
-        'emergency_risk': emergency_risk,
-        'overall_risk': min(1.0, (vital_risk + symptom_risk + history_risk) / 3)
+        'primary_assessment': 'No symptoms reported and vital signs within normal ranges',
+        'differential_diagnosis': [],
+        'severity_level': 'LOW',
+        'immediate_actions': [],
+        'recommendations': [
+            {
+                'category': 'general',
+                'action': 'Continue routine health monitoring',
+                'priority': 'LOW',
+                'timeframe': '1month'
+            }
+        ],
+        'red_flags': [],
+        'follow_up': {
+            'required': False,
+            'timeframe': 'routine',
+            'specialist': None
+        },
+        'model_skipped': True
     }
 
-def determine_urgency_level(risk_assessment: Dict[str, float]) -> str:
-    """Determine urgency level based on risk assessment"""
-    emergency_risk = risk_assessment['emergency_risk']
+def build_analysis_record(patient_id: str, processed_symptoms: List, vital_signs: Dict,
+                          medical_history: List, analysis_result: Dict[str, Any],
+                          now_ts: int, now_iso: str) -> Dict[str, Any]:
+    """Score risk and assemble the analysis record stored in DynamoDB"""
+    risk = calculate_risk_scores(vital_signs, processed_symptoms, medical_history)
     
+    return {
+        # The random suffix keeps two analyses of one patient in the same
+        # second from overwriting each other, so each record is an INSERT
+        'analysis_id': f"{patient_id}_{now_ts}_{uuid.uuid4().hex[:8]}",
+        'patient_id': patient_id,
+        'timestamp': now_iso,
+        'symptoms': processed_symptoms,
+        'vital_signs': vital_signs,
+        'analysis_result': analysis_result,
+        'risk_assessment': asdict(risk),
+        'recommendations': analysis_result.get('recommendations', []),
+        'urgency_level': determine_urgency_level(risk.emergency_risk),
+        'event_type': 'analysis_complete',
+        'dispatch_required': risk.emergency_risk > 0.8,
+        'ttl': now_ts + 31536000  # 1 year TTL
+    }
+
+def analysis_response(analysis_record: Dict[str, Any]) -> Dict[str, Any]:
+    """Client-facing view of an analysis record"""
+    return {
+        'analysis_id': analysis_record['analysis_id'],
+        'patient_id': analysis_record['patient_id'],
+        'analysis_result': analysis_record['analysis_result'],
+        'risk_assessment': analysis_record['risk_assessment'],
+        'urgency_level': analysis_record['urgency_level'],
+        'recommendations': analysis_record['recommendations'],
+        'timestamp': analysis_record['timestamp']
+    }
+
+@lru_cache(maxsize=8)
+def get_management_client(endpoint_url: str):
+    """API Gateway Management API client for a WebSocket stage, reused across invocations"""
+    return boto3.client('apigatewaymanagementapi', endpoint_url=endpoint_url, config=AWS_CONFIG)
+
+def post_to_connection(client, connection_id: str, message: Dict[str, Any]) -> None:
+    """Push a message to a WebSocket client; a disconnected client doesn't fail the analysis"""
+    try:
+        client.post_to_connection(ConnectionId=connection_id, Data=orjson.dumps(message))
+    except ClientError as e:
+        logger.warning(f"Failed to post to connection {connection_id}: {str(e)}")
+
+def vitals_row(vital_signs: Dict) -> List[float]:
+    """Lay out one patient's vital signs by VitalIdx; missing values are NaN"""
+    bp = vital_signs.get('blood_pressure', {})
+    return [
+        vital_signs.get('heart_rate', np.nan),
+        bp.get('systolic', np.nan),
+        bp.get('diastolic', np.nan),
+        vital_signs.get('temperature', np.nan)
+    ]
+
+def calculate_risk_scores_batch(vitals: np.ndarray, symptom_counts: np.ndarray, history_counts: np.ndarray) -> np.ndarray:
+    """
+    Calculate risk scores for many patients at once
+    
+    Args:
+        vitals: (N, 4) float array with columns indexed by VitalIdx; NaN marks a missing vital sign
+        symptom_counts: High-risk symptom matches per patient
+        history_counts: High-risk condition matches per patient
+        
+    Returns:
+        (N, 5) array with columns in RiskAssessment field order
+    """
+    hr = vitals[:, VitalIdx.HEART_RATE]
+    systolic = vitals[:, VitalIdx.SYSTOLIC]
+    diastolic = vitals[:, VitalIdx.DIASTOLIC]
+    temp = vitals[:, VitalIdx.TEMPERATURE]
+    
+    # Comparisons against NaN are False, so missing vitals add no risk
+    vital_risk = (
+        0.3 * ((hr < 60) | (hr > 100))
+        + 0.4 * ((hr < 50) | (hr > 120))
+        + 0.4 * ((systolic > 140) | (diastolic > 90))
+        + 0.6 * ((systolic > 180) | (diastolic > 110))
+        + 0.2 * ((temp > 38.0) | (temp < 36.0))
+        + 0.5 * ((temp > 39.5) | (temp < 35.0))
+    )
+    symptom_risk = 0.4 * symptom_counts
+    history_risk = 0.2 * history_counts
+    
+    return np.column_stack((
+        np.minimum(1.0, vital_risk),
+        np.minimum(1.0, symptom_risk),
+        np.minimum(1.0, history_risk),
+        np.minimum(1.0, vital_risk + symptom_risk + (history_risk * 0.5)),
+        np.minimum(1.0, (vital_risk + symptom_risk + history_risk) / 3)
+    ))
+
+def count_matching_entries(pattern: re.Pattern, entries: List[str]) -> int:
+    """Number of entries containing a match, from a single scan over all of them"""
+    return sum(1 for _ in pattern.finditer(ENTRY_SEPARATOR.join(entries)))
+
+def calculate_risk_scores(vital_signs: Dict, symptoms: List, medical_history: List) -> RiskAssessment:
+    """Calculate comprehensive risk scores based on health data"""
+    symptom_count = count_matching_entries(HIGH_RISK_SYMPTOM_PATTERN, [symptom['text'] for symptom in symptoms])
+    history_count = count_matching_entries(HIGH_RISK_CONDITION_PATTERN, medical_history)
+    
+    scores = calculate_risk_scores_batch(
+        np.array([vitals_row(vital_signs)], dtype=np.float64),
+        np.array([symptom_count]),
+        np.array([history_count])
+    )[0]
+    return RiskAssessment(*map(float, scores))
+
+def determine_urgency_level(emergency_risk: float) -> str:
+    """Determine urgency level based on emergency risk"""
     if emergency_risk >= 0.8:
         return 'CRITICAL'
     elif emergency_risk >= 0.6:
@@ -222,52 +661,3 @@ def determine_urgency_level(risk_assessment: Dict[str, float]) -> str:
         return 'MEDIUM'
     else:
         return 'LOW'
-
-async def handle_emergency_alert(patient_id: str, analysis_record: Dict) -> None:
-    """Handle emergency alert notifications"""
-    try:
-        message = {
-            'patient_id': patient_id,
-            'analysis_id': analysis_record['analysis_id'],
-            'urgency_level': analysis_record['urgency_level'],
-            'risk_score': analysis_record['risk_assessment']['emergency_risk'],
-            'timestamp': analysis_record['timestamp'],
-            'vital_signs': analysis_record['vital_signs'],
-            'symptoms': analysis_record['symptoms']
-        }
-        
-        # Send SNS notification
-        sns.publish(
-            TopicArn=EMERGENCY_TOPIC_ARN,
-            Message=json.dumps(message),
-            Subject=f'EMERGENCY ALERT - Patient {patient_id}'
-        )
-        
-        logger.info(f"Emergency alert sent for patient: {patient_id}")
-        
-    except Exception as e:
-        logger.error(f"Failed to send emergency alert: {str(e)}")
-
-async def send_analysis_event(patient_id: str, analysis_record: Dict) -> None:
-    """Send analysis completion event to EventBridge"""
-    try:
-        event_detail = {
-            'patient_id': patient_id,
-            'analysis_id': analysis_record['analysis_id'],
-            'urgency_level': analysis_record['urgency_level'],
-            'timestamp': analysis_record['timestamp']
-        }
-        
-        eventbridge.put_events(
-            Entries=[
-                {
-                    'Source': 'healthconnect.analysis',
-                    'DetailType': 'Health Analysis Complete',
-                    'Detail': json.dumps(event_detail),
-                    'EventBusName': EVENT_BUS_NAME
-                }
-            ]
-        )
-        
-    except Exception as e:
-        logger.error(f"Failed to send analysis event: {str(e)}")
@@ -2,30 +2,46 @@ import logging
 import re
 from typing import Dict, List, Any, Optional, Tuple
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import json
 import os
 
 logger = logging.getLogger(__name__)
 
+# Created once per container so warm invocations reuse the connection pool
+AWS_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=int(os.environ.get('BOTO_MAX_POOL', '50')),
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+COMPREHEND_MEDICAL = boto3.client(
+    'comprehendmedical',
+    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+    config=AWS_CONFIG
+)
+
+# Medical term patterns for enhanced processing, compiled into one
+# alternation of named groups so the text is scanned once and each match
+# reports its category through lastgroup
+SYMPTOM_PATTERNS = {
+    'pain': r'pain|ache|aching|hurt|hurting|sore|tender|throbbing|stabbing|burning|sharp|dull',
+    'breathing': r'breath|breathing|dyspnea|shortness of breath|sob|wheezing|cough|coughing',
+    'cardiac': r'chest pain|palpitations|heart|cardiac|tachycardia|bradycardia|arrhythmia',
+    'neurological': r'headache|dizziness|dizzy|confusion|confused|seizure|numbness|tingling',
+    'gastrointestinal': r'nausea|vomiting|diarrhea|constipation|abdominal|stomach|belly',
+    'fever': r'fever|febrile|hot|chills|sweating|temperature'
+}
+SYMPTOM_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<{category}>{terms})' for category, terms in SYMPTOM_PATTERNS.items()) + r')\b',
+    re.IGNORECASE
+)
+
 class MedicalNLPProcessor:
     """Production-grade medical NLP processor using AWS Comprehend Medical"""
     
     def __init__(self):
-        self.comprehend_medical = boto3.client(
-            'comprehendmedical',
-            region_name=os.environ.get('AWS_REGION', 'us-east-1')
-        )
-        
-        # Medical term patterns for enhanced processing
-        self.symptom_patterns = {
-            'pain': r'\b(?:pain|ache|aching|hurt|hurting|sore|tender|throbbing|stabbing|burning|sharp|dull)\b',
-            'breathing': r'\b(?:breath|breathing|dyspnea|shortness of breath|sob|wheezing|cough|coughing)\b',
-            'cardiac': r'\b(?:chest pain|palpitations|heart|cardiac|tachycardia|bradycardia|arrhythmia)\b',
-            'neurological': r'\b(?:headache|dizziness|dizzy|confusion|confused|seizure|numbness|tingling)\b',
-            'gastrointestinal': r'\b(?:nausea|vomiting|diarrhea|constipation|abdominal|stomach|belly)\b',
-            'fever': r'\b(?:fever|febrile|hot|chills|sweating|temperature)\b'
-        }
+        self.comprehend_medical = COMPREHEND_MEDICAL
         
     def extract_medical_entities(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -188,22 +204,20 @@ class MedicalNLPProcessor:
         """Extract entities using regex patterns as fallback"""
         entities = []
         
-        for category, pattern in self.symptom_patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                entities.append({
-                    'text': match.group(),
-                    'category': 'MEDICAL_CONDITION',
-                    'type': category.upper(),
-                    'confidence': 0.7,  # Lower confidence for pattern matching
-                    'begin_offset': match.start(),
-                    'end_offset': match.end(),
-                    'attributes': [],
-                    'severity': self._analyze_severity(match.group(), text),
-                    'context': text[max(0, match.start()-50):match.end()+50],
-                    'normalized_term': self._normalize_medical_term(match.group()),
-                    'source': 'pattern_matching'
-                })
+        for match in SYMPTOM_PATTERN.finditer(text):
+            entities.append({
+                'text': match.group(),
+                'category': 'MEDICAL_CONDITION',
+                'type': match.lastgroup.upper(),
+                'confidence': 0.7,  # Lower confidence for pattern matching
+                'begin_offset': match.start(),
+                'end_offset': match.end(),
+                'attributes': [],
+                'severity': self._analyze_severity(match.group(), text),
+                'context': text[max(0, match.start()-50):match.end()+50],
+                'normalized_term': self._normalize_medical_term(match.group()),
+                'source': 'pattern_matching'
+            })
         
         return entities
     
@@ -0,0 +1,28 @@
+import os
+import sys
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bedrock_client import BedrockHealthAnalyzer
+
+ANALYZER = BedrockHealthAnalyzer()
+
+def cache_key(vital_signs):
+    return ANALYZER._cache_key({'symptoms': [], 'vital_signs': vital_signs})
+
+def test_values_across_a_threshold_get_different_keys():
+    straddling = (
+        ({'heart_rate': 100}, {'heart_rate': 109}),
+        ({'heart_rate': 60}, {'heart_rate': 59}),
+        ({'temperature': 38.0}, {'temperature': 38.4}),
+        ({'oxygen_saturation': 95}, {'oxygen_saturation': 94.5}),
+        ({'blood_pressure': {'systolic': 140, 'diastolic': 80}}, {'blood_pressure': {'systolic': 149, 'diastolic': 80}}),
+        ({'blood_pressure': {'systolic': 120, 'diastolic': 90}}, {'blood_pressure': {'systolic': 120, 'diastolic': 91}})
+    )
+    for normal, abnormal in straddling:
+        assert cache_key(normal) != cache_key(abnormal), abnormal
+
+def test_values_within_one_band_share_a_key():
+    assert cache_key({'heart_rate': 101}) == cache_key({'heart_rate': 109})
+    assert cache_key({'temperature': 36.6}) == cache_key({'temperature': 36.9})
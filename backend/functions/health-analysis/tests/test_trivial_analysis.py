@@ -0,0 +1,44 @@
+import os
+import sys
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('HEALTH_RECORDS_TABLE', 'health-records')
+os.environ.setdefault('ANALYSIS_RESULTS_TABLE', 'analysis-results')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handler import trivial_analysis
+
+NORMAL_VITALS = {
+    'heart_rate': 72,
+    'blood_pressure': {'systolic': 118, 'diastolic': 76},
+    'temperature': 36.8,
+    'oxygen_saturation': 98,
+    'respiratory_rate': 14
+}
+
+def test_normal_vitals_without_symptoms_skip_the_model():
+    result = trivial_analysis('', NORMAL_VITALS, [])
+    assert result is not None
+    assert result['severity_level'] == 'LOW'
+
+def test_hypoxia_and_tachypnea_go_to_the_model():
+    assert trivial_analysis('', {'oxygen_saturation': 78, 'respiratory_rate': 34}, []) is None
+
+def test_each_out_of_range_vital_goes_to_the_model():
+    abnormal = (
+        ('heart_rate', 109),
+        ('temperature', 38.4),
+        ('oxygen_saturation', 93),
+        ('respiratory_rate', 10),
+        ('respiratory_rate', 22),
+        ('blood_pressure', {'systolic': 85, 'diastolic': 60})
+    )
+    for name, value in abnormal:
+        assert trivial_analysis('', {**NORMAL_VITALS, name: value}, []) is None, name
+
+def test_unranged_vital_goes_to_the_model():
+    assert trivial_analysis('', {**NORMAL_VITALS, 'blood_glucose': 40}, []) is None
+
+def test_symptoms_or_high_risk_history_go_to_the_model():
+    assert trivial_analysis('chest pain', NORMAL_VITALS, []) is None
+    assert trivial_analysis('', NORMAL_VITALS, ['Diabetes', 'Heart disease']) is None
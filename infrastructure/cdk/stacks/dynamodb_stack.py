@@ -440,6 +440,20 @@ class DynamoDBStack(Stack):
             projection_type=dynamodb.ProjectionType.ALL
         )
         
+        # Add GSI for listing recent alerts by weekly time bucket
+        self.tables["emergency_alerts"].add_global_secondary_index(
+            index_name="BucketIndex",
+            partition_key=dynamodb.Attribute(
+                name="bucket",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="created_at",
+                type=dynamodb.AttributeType.STRING
+            ),
+            projection_type=dynamodb.ProjectionType.ALL
+        )
+        
         # Emergency Contacts Table
         self.tables["emergency_contacts"] = dynamodb.Table(
             self, "EmergencyContactsTable",
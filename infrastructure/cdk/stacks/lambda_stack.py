@@ -381,8 +381,7 @@ class LambdaStack(Stack):
             "EMERGENCY_ALERTS_TABLE": self.dynamodb_tables["emergency_alerts"].table_name,
             "EMERGENCY_CONTACTS_TABLE": self.dynamodb_tables["emergency_contacts"].table_name,
             "EMERGENCY_TOPIC_ARN": f"arn:aws:sns:{self.region}:{self.account}:healthconnect-emergency-{self.env_name}",
-            "EVENT_BUS_NAME": f"healthconnect-events-{self.env_name}",
-            "CONSULTATION_FUNCTION_ARN": f"arn:aws:lambda:{self.region}:{self.account}:function:healthconnect-consultation-{self.env_name}"
+            "EVENT_BUS_NAME": f"healthconnect-events-{self.env_name}"
         }
         
         # Create function
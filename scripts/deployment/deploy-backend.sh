@@ -74,6 +74,37 @@ check_prerequisites() {
     success "Prerequisites check passed"
 }
 
+# Modules compiled to C extensions with mypyc, keyed by function directory
+declare -A MYPYC_MODULES=(
+    ["emergency-response"]="alert_system.py"
+)
+
+# Compile listed modules in place; the .so shadows the .py at import time
+compile_native_modules() {
+    local function_name="$1"
+    local package_dir="$2"
+    local modules="${MYPYC_MODULES[$function_name]:-}"
+    
+    if [[ -z "$modules" || "${SKIP_MYPYC:-false}" == "true" ]]; then
+        return 0
+    fi
+    
+    if ! command -v mypyc &> /dev/null; then
+        warning "mypyc not installed, shipping pure-Python modules for $function_name"
+        return 0
+    fi
+    
+    # Extensions must match the Lambda runtime ABI (CPython ${LAMBDA_RUNTIME#python} on Linux)
+    local python_version=$(python3 -c 'import sys; print(f"{sys.version_info[0]}.{sys.version_info[1]}")')
+    if [[ "python$python_version" != "$LAMBDA_RUNTIME" || "$(uname -s)" != "Linux" ]]; then
+        warning "Build host does not match $LAMBDA_RUNTIME on Linux, skipping mypyc for $function_name"
+        return 0
+    fi
+    
+    log "Compiling $modules with mypyc for $function_name..."
+    (cd "$package_dir" && mypyc $modules && rm -rf build)
+}
+
 # Install dependencies and create deployment package
 create_deployment_package() {
     local function_name="$1"
@@ -102,6 +133,9 @@ create_deployment_package() {
     # Install common requirements
     pip3 install -r backend/requirements.txt -t "$package_dir/"
     
+    # AOT-compile hot pure-Python modules with mypyc
+    compile_native_modules "$function_name" "$package_dir"
+    
     # Remove unnecessary files
     find "$package_dir" -type d -name "__pycache__" -exec rm -rf {} + 2>/dev/null || true
     find "$package_dir" -type f -name "*.pyc" -delete 2>/dev/null || true